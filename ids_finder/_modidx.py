@@ -5,10 +5,60 @@ d = { 'settings': { 'branch': 'main',
                 'doc_host': 'https://Beforerr.github.io',
                 'git_url': 'https://github.com/Beforerr/ids_finder',
                 'lib_path': 'ids_finder'},
-  'syms': { 'ids_finder.core.detection': { 'ids_finder.core.detection._compute_indices': ( 'ids_detection.html#_compute_indices',
+  'syms': { 'ids_finder.benchmark': { 'ids_finder.benchmark.benchmark_stages': ( 'benchmark.html#benchmark_stages',
+                                                                                 'ids_finder/benchmark.py'),
+                                      'ids_finder.benchmark.ids_benchmark': ('benchmark.html#ids_benchmark', 'ids_finder/benchmark.py'),
+                                      'ids_finder.benchmark.measure': ('benchmark.html#measure', 'ids_finder/benchmark.py'),
+                                      'ids_finder.benchmark.recall': ('benchmark.html#recall', 'ids_finder/benchmark.py'),
+                                      'ids_finder.benchmark.run_benchmark': ('benchmark.html#run_benchmark', 'ids_finder/benchmark.py')},
+            'ids_finder.core.detection': { 'ids_finder.core.detection.DetectionThresholds': ( 'ids_detection.html#detectionthresholds',
+                                                                                              'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._batch_block_stats': ( 'ids_detection.html#_batch_block_stats',
+                                                                                             'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._bfill_index': ( 'ids_detection.html#_bfill_index',
+                                                                                       'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._block_stats_schema': ( 'ids_detection.html#_block_stats_schema',
+                                                                                              'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._combine_moments': ( 'ids_detection.html#_combine_moments',
+                                                                                           'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._compute_indices': ( 'ids_detection.html#_compute_indices',
                                                                                            'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._compute_indices_cumsum': ( 'ids_detection.html#_compute_indices_cumsum',
+                                                                                                  'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._compute_indices_grid': ( 'ids_detection.html#_compute_indices_grid',
+                                                                                                'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._cumsum0': ( 'ids_detection.html#_cumsum0',
+                                                                                   'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._drop_missing_windows': ( 'ids_detection.html#_drop_missing_windows',
+                                                                                                'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._ffill_index': ( 'ids_detection.html#_ffill_index',
+                                                                                       'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._gcd_timedelta': ( 'ids_detection.html#_gcd_timedelta',
+                                                                                         'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._grid_combined_std': ( 'ids_detection.html#_grid_combined_std',
+                                                                                             'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._grid_neighbor_std': ( 'ids_detection.html#_grid_neighbor_std',
+                                                                                             'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._indices_to_events': ( 'ids_detection.html#_indices_to_events',
+                                                                                             'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._merge_block_stats': ( 'ids_detection.html#_merge_block_stats',
+                                                                                             'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._moments_std': ( 'ids_detection.html#_moments_std',
+                                                                                       'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._threshold_counts': ( 'ids_detection.html#_threshold_counts',
+                                                                                            'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._time_to_int': ( 'ids_detection.html#_time_to_int',
+                                                                                       'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection._window_moments': ( 'ids_detection.html#_window_moments',
+                                                                                          'ids_finder/core/detection.py'),
                                            'ids_finder.core.detection.add_neighbor_std': ( 'ids_detection.html#add_neighbor_std',
                                                                                            'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection.block_length': ( 'ids_detection.html#block_length',
+                                                                                       'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection.compute_block_stats': ( 'ids_detection.html#compute_block_stats',
+                                                                                              'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection.compute_block_stats_lazy': ( 'ids_detection.html#compute_block_stats_lazy',
+                                                                                                   'ids_finder/core/detection.py'),
                                            'ids_finder.core.detection.compute_combinded_std': ( 'ids_detection.html#compute_combinded_std',
                                                                                                 'ids_finder/core/detection.py'),
                                            'ids_finder.core.detection.compute_index_diff': ( 'ids_detection.html#compute_index_diff',
@@ -19,23 +69,114 @@ d = { 'settings': { 'branch': 'main',
                                                                                             'ids_finder/core/detection.py'),
                                            'ids_finder.core.detection.compute_indices': ( 'ids_detection.html#compute_indices',
                                                                                           'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection.compute_indices_cached': ( 'ids_detection.html#compute_indices_cached',
+                                                                                                 'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection.compute_indices_from_blocks': ( 'ids_detection.html#compute_indices_from_blocks',
+                                                                                                      'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection.compute_multi_tau_indices': ( 'ids_detection.html#compute_multi_tau_indices',
+                                                                                                    'ids_finder/core/detection.py'),
                                            'ids_finder.core.detection.compute_std': ( 'ids_detection.html#compute_std',
                                                                                       'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection.compute_window_stats': ( 'ids_detection.html#compute_window_stats',
+                                                                                               'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection.dense_block_stats': ( 'ids_detection.html#dense_block_stats',
+                                                                                            'ids_finder/core/detection.py'),
                                            'ids_finder.core.detection.detect_events': ( 'ids_detection.html#detect_events',
                                                                                         'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection.detect_events_from_blocks': ( 'ids_detection.html#detect_events_from_blocks',
+                                                                                                    'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection.detect_events_lazy': ( 'ids_detection.html#detect_events_lazy',
+                                                                                             'ids_finder/core/detection.py'),
                                            'ids_finder.core.detection.filter_indices': ( 'ids_detection.html#filter_indices',
                                                                                          'ids_finder/core/detection.py'),
                                            'ids_finder.core.detection.pl_dvec': ( 'ids_detection.html#pl_dvec',
                                                                                   'ids_finder/core/detection.py'),
                                            'ids_finder.core.detection.pl_format_time': ( 'ids_detection.html#pl_format_time',
-                                                                                         'ids_finder/core/detection.py')},
-            'ids_finder.core.pipeline': { 'ids_finder.core.pipeline.compress_data_by_cands': ( 'ids_finder.html#compress_data_by_cands',
+                                                                                         'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection.sweep_thresholds': ( 'ids_detection.html#sweep_thresholds',
+                                                                                           'ids_finder/core/detection.py'),
+                                           'ids_finder.core.detection.time_grid': ( 'ids_detection.html#time_grid',
+                                                                                    'ids_finder/core/detection.py')},
+            'ids_finder.core.pipeline': { 'ids_finder.core.pipeline.StageMetrics': ( 'ids_finder.html#stagemetrics',
+                                                                                     'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline.StageMetrics.__init__': ( 'ids_finder.html#stagemetrics.__init__',
+                                                                                              'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline.StageMetrics.log': ( 'ids_finder.html#stagemetrics.log',
+                                                                                         'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline.StageMetrics.record': ( 'ids_finder.html#stagemetrics.record',
+                                                                                            'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline.StageMetrics.stage': ( 'ids_finder.html#stagemetrics.stage',
+                                                                                           'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline._halo': ('ids_finder.html#_halo', 'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline._ids_finder_checkpoint': ( 'ids_finder.html#_ids_finder_checkpoint',
+                                                                                               'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline._ids_finder_window': ( 'ids_finder.html#_ids_finder_window',
+                                                                                           'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline._partition_path': ( 'ids_finder.html#_partition_path',
+                                                                                        'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline._unique_ids': ( 'ids_finder.html#_unique_ids',
+                                                                                    'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline._work_units': ( 'ids_finder.html#_work_units',
+                                                                                    'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline._worker_env': ( 'ids_finder.html#_worker_env',
+                                                                                    'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline.compress_data_by_cands': ( 'ids_finder.html#compress_data_by_cands',
                                                                                                'ids_finder/core/pipeline.py'),
                                           'ids_finder.core.pipeline.extract_features': ( 'ids_finder.html#extract_features',
                                                                                          'ids_finder/core/pipeline.py'),
                                           'ids_finder.core.pipeline.ids_finder': ( 'ids_finder.html#ids_finder',
-                                                                                   'ids_finder/core/pipeline.py')},
-            'ids_finder.core.propeties': { 'ids_finder.core.propeties.IDsPipeline': ( 'ids_properties.html#idspipeline',
+                                                                                   'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline.ids_finder_chunked': ( 'ids_finder.html#ids_finder_chunked',
+                                                                                           'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline.ids_finder_incremental': ( 'ids_finder.html#ids_finder_incremental',
+                                                                                               'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline.load_candidate_windows': ( 'ids_finder.html#load_candidate_windows',
+                                                                                               'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline.map_partitions': ( 'ids_finder.html#map_partitions',
+                                                                                       'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline.parquet_time_range': ( 'ids_finder.html#parquet_time_range',
+                                                                                           'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline.partition_time_ranges': ( 'ids_finder.html#partition_time_ranges',
+                                                                                              'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline.schedule_work_units': ( 'ids_finder.html#schedule_work_units',
+                                                                                            'ids_finder/core/pipeline.py'),
+                                          'ids_finder.core.pipeline.sink_candidates': ( 'ids_finder.html#sink_candidates',
+                                                                                        'ids_finder/core/pipeline.py')},
+            'ids_finder.core.propeties': { 'ids_finder.core.propeties.CandidateWindowIndex': ( 'ids_properties.html#candidatewindowindex',
+                                                                                               'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.CandidateWindowIndex.__getitem__': ( 'ids_properties.html#candidatewindowindex.__getitem__',
+                                                                                                           'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.CandidateWindowIndex.__len__': ( 'ids_properties.html#candidatewindowindex.__len__',
+                                                                                                       'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.CandidateWindowIndex.counts': ( 'ids_properties.html#candidatewindowindex.counts',
+                                                                                                      'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.CandidateWindowIndex.first': ( 'ids_properties.html#candidatewindowindex.first',
+                                                                                                     'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.CandidateWindowIndex.from_times': ( 'ids_properties.html#candidatewindowindex.from_times',
+                                                                                                          'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.CandidateWindowIndex.gather': ( 'ids_properties.html#candidatewindowindex.gather',
+                                                                                                      'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.CandidateWindowIndex.indices': ( 'ids_properties.html#candidatewindowindex.indices',
+                                                                                                       'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.CandidateWindowIndex.last': ( 'ids_properties.html#candidatewindowindex.last',
+                                                                                                    'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.CandidateWindowIndex.offsets': ( 'ids_properties.html#candidatewindowindex.offsets',
+                                                                                                       'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.CandidateWindowIndex.with_durations': ( 'ids_properties.html#candidatewindowindex.with_durations',
+                                                                                                              'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.FeatureCache': ( 'ids_properties.html#featurecache',
+                                                                                       'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.FeatureCache.__init__': ( 'ids_properties.html#featurecache.__init__',
+                                                                                                'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.FeatureCache.get_or_compute': ( 'ids_properties.html#featurecache.get_or_compute',
+                                                                                                      'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.FeatureCache.keys': ( 'ids_properties.html#featurecache.keys',
+                                                                                            'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.FeatureCache.lookup': ( 'ids_properties.html#featurecache.lookup',
+                                                                                              'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.FeatureCache.save': ( 'ids_properties.html#featurecache.save',
+                                                                                            'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.IDsPipeline': ( 'ids_properties.html#idspipeline',
                                                                                       'ids_finder/core/propeties.py'),
                                            'ids_finder.core.propeties.IDsPipeline.__init__': ( 'ids_properties.html#idspipeline.__init__',
                                                                                                'ids_finder/core/propeties.py'),
@@ -49,6 +190,38 @@ d = { 'settings': { 'branch': 'main',
                                                                                                           'ids_finder/core/propeties.py'),
                                            'ids_finder.core.propeties.IDsPipeline.calc_vec_change': ( 'ids_properties.html#idspipeline.calc_vec_change',
                                                                                                       'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties._attach_shared_arrays': ( 'ids_properties.html#_attach_shared_arrays',
+                                                                                                'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties._duration_indices': ( 'ids_properties.html#_duration_indices',
+                                                                                            'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties._event_properties': ( 'ids_properties.html#_event_properties',
+                                                                                            'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties._event_properties_pool': ( 'ids_properties.html#_event_properties_pool',
+                                                                                                 'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties._event_status': ( 'ids_properties.html#_event_status',
+                                                                                        'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties._feature_version': ( 'ids_properties.html#_feature_version',
+                                                                                           'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties._fgm_arrays': ( 'ids_properties.html#_fgm_arrays',
+                                                                                      'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties._is_degenerate': ( 'ids_properties.html#_is_degenerate',
+                                                                                         'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties._mva_features_arrays': ( 'ids_properties.html#_mva_features_arrays',
+                                                                                               'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties._process_events_legacy': ( 'ids_properties.html#_process_events_legacy',
+                                                                                                 'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties._process_events_native': ( 'ids_properties.html#_process_events_native',
+                                                                                                 'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties._segment_gradient': ( 'ids_properties.html#_segment_gradient',
+                                                                                            'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties._segment_reduce': ( 'ids_properties.html#_segment_reduce',
+                                                                                          'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties._share_array': ( 'ids_properties.html#_share_array',
+                                                                                       'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties._shared_event_properties': ( 'ids_properties.html#_shared_event_properties',
+                                                                                                   'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties._splitmix64': ( 'ids_properties.html#_splitmix64',
+                                                                                      'ids_finder/core/propeties.py'),
                                            'ids_finder.core.propeties.calc_candidate_duration': ( 'ids_properties.html#calc_candidate_duration',
                                                                                                   'ids_finder/core/propeties.py'),
                                            'ids_finder.core.propeties.calc_candidate_mva_features': ( 'ids_properties.html#calc_candidate_mva_features',
@@ -57,6 +230,8 @@ d = { 'settings': { 'branch': 'main',
                                                                                           'ids_finder/core/propeties.py'),
                                            'ids_finder.core.propeties.calc_duration': ( 'ids_properties.html#calc_duration',
                                                                                         'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.calc_duration_batch': ( 'ids_properties.html#calc_duration_batch',
+                                                                                              'ids_finder/core/propeties.py'),
                                            'ids_finder.core.propeties.calc_events_normal_direction': ( 'ids_properties.html#calc_events_normal_direction',
                                                                                                        'ids_finder/core/propeties.py'),
                                            'ids_finder.core.propeties.calc_events_rotation_angle': ( 'ids_properties.html#calc_events_rotation_angle',
@@ -67,6 +242,8 @@ d = { 'settings': { 'branch': 'main',
                                                                                                 'ids_finder/core/propeties.py'),
                                            'ids_finder.core.propeties.calc_rotation_angle': ( 'ids_properties.html#calc_rotation_angle',
                                                                                               'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.cluster_candidates': ( 'ids_properties.html#cluster_candidates',
+                                                                                             'ids_finder/core/propeties.py'),
                                            'ids_finder.core.propeties.find_start_end_times': ( 'ids_properties.html#find_start_end_times',
                                                                                                'ids_finder/core/propeties.py'),
                                            'ids_finder.core.propeties.get_candidate_data': ( 'ids_properties.html#get_candidate_data',
@@ -79,12 +256,18 @@ d = { 'settings': { 'branch': 'main',
                                                                                                   'ids_finder/core/propeties.py'),
                                            'ids_finder.core.propeties.minvar': ( 'ids_properties.html#minvar',
                                                                                  'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.minvar_batch': ( 'ids_properties.html#minvar_batch',
+                                                                                       'ids_finder/core/propeties.py'),
                                            'ids_finder.core.propeties.mva_features': ( 'ids_properties.html#mva_features',
                                                                                        'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.mva_features_batch': ( 'ids_properties.html#mva_features_batch',
+                                                                                             'ids_finder/core/propeties.py'),
                                            'ids_finder.core.propeties.pdp.ApplyToRows._transform': ( 'ids_properties.html#pdp.applytorows._transform',
                                                                                                      'ids_finder/core/propeties.py'),
                                            'ids_finder.core.propeties.process_events': ( 'ids_properties.html#process_events',
-                                                                                         'ids_finder/core/propeties.py')},
+                                                                                         'ids_finder/core/propeties.py'),
+                                           'ids_finder.core.propeties.window_hashes': ( 'ids_properties.html#window_hashes',
+                                                                                        'ids_finder/core/propeties.py')},
             'ids_finder.datasets': { 'ids_finder.datasets.CandidateID': ('datasets.html#candidateid', 'ids_finder/datasets.py'),
                                      'ids_finder.datasets.CandidateID.__init__': ( 'datasets.html#candidateid.__init__',
                                                                                    'ids_finder/datasets.py'),
@@ -104,14 +287,60 @@ d = { 'settings': { 'branch': 'main',
                                                                                     'ids_finder/datasets.py'),
                                      'ids_finder.datasets.cIDsDataset.load_events': ( 'datasets.html#cidsdataset.load_events',
                                                                                       'ids_finder/datasets.py')},
+            'ids_finder.hooks': { 'ids_finder.hooks.ProfilingHooks': ('hooks.html#profilinghooks', 'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks.__init__': ('hooks.html#profilinghooks.__init__', 'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks._dataset_record': ( 'hooks.html#profilinghooks._dataset_record',
+                                                                                       'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks._end_node': ( 'hooks.html#profilinghooks._end_node',
+                                                                                 'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks._flush': ('hooks.html#profilinghooks._flush', 'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks._parts_dir': ( 'hooks.html#profilinghooks._parts_dir',
+                                                                                  'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks._save_run_metrics': ( 'hooks.html#profilinghooks._save_run_metrics',
+                                                                                         'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks._start': ('hooks.html#profilinghooks._start', 'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks._stop': ('hooks.html#profilinghooks._stop', 'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks._tracked': ('hooks.html#profilinghooks._tracked', 'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks.after_catalog_created': ( 'hooks.html#profilinghooks.after_catalog_created',
+                                                                                             'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks.after_dataset_loaded': ( 'hooks.html#profilinghooks.after_dataset_loaded',
+                                                                                            'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks.after_dataset_saved': ( 'hooks.html#profilinghooks.after_dataset_saved',
+                                                                                           'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks.after_node_run': ( 'hooks.html#profilinghooks.after_node_run',
+                                                                                      'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks.after_pipeline_run': ( 'hooks.html#profilinghooks.after_pipeline_run',
+                                                                                          'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks.before_dataset_loaded': ( 'hooks.html#profilinghooks.before_dataset_loaded',
+                                                                                             'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks.before_dataset_saved': ( 'hooks.html#profilinghooks.before_dataset_saved',
+                                                                                            'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks.before_node_run': ( 'hooks.html#profilinghooks.before_node_run',
+                                                                                       'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks.before_pipeline_run': ( 'hooks.html#profilinghooks.before_pipeline_run',
+                                                                                           'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks.on_node_error': ( 'hooks.html#profilinghooks.on_node_error',
+                                                                                     'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.ProfilingHooks.on_pipeline_error': ( 'hooks.html#profilinghooks.on_pipeline_error',
+                                                                                         'ids_finder/hooks.py'),
+                                  'ids_finder.hooks._cpu_time': ('hooks.html#_cpu_time', 'ids_finder/hooks.py'),
+                                  'ids_finder.hooks._peak_rss': ('hooks.html#_peak_rss', 'ids_finder/hooks.py'),
+                                  'ids_finder.hooks._reset_peak_rss': ('hooks.html#_reset_peak_rss', 'ids_finder/hooks.py'),
+                                  'ids_finder.hooks._rss': ('hooks.html#_rss', 'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.data_size': ('hooks.html#data_size', 'ids_finder/hooks.py'),
+                                  'ids_finder.hooks.storage_size': ('hooks.html#storage_size', 'ids_finder/hooks.py')},
             'ids_finder.pipeline_registry': {},
             'ids_finder.pipelines.default.data': { 'ids_finder.pipelines.default.data.create_pipeline_template': ( 'pipelines/data.html#create_pipeline_template',
                                                                                                                    'ids_finder/pipelines/default/data.py')},
-            'ids_finder.pipelines.default.data_mag': { 'ids_finder.pipelines.default.data_mag.create_extra_pipeline': ( 'pipelines/data_mag.html#create_extra_pipeline',
+            'ids_finder.pipelines.default.data_mag': { 'ids_finder.pipelines.default.data_mag._with_run_options': ( 'pipelines/data_mag.html#_with_run_options',
+                                                                                                                    'ids_finder/pipelines/default/data_mag.py'),
+                                                       'ids_finder.pipelines.default.data_mag.create_extra_pipeline': ( 'pipelines/data_mag.html#create_extra_pipeline',
                                                                                                                         'ids_finder/pipelines/default/data_mag.py'),
                                                        'ids_finder.pipelines.default.data_mag.create_pipeline_template': ( 'pipelines/data_mag.html#create_pipeline_template',
                                                                                                                            'ids_finder/pipelines/default/data_mag.py')},
-            'ids_finder.pipelines.default.mission': { 'ids_finder.pipelines.default.mission.calc_combined_features': ( 'pipelines/mission.html#calc_combined_features',
+            'ids_finder.pipelines.default.mission': { 'ids_finder.pipelines.default.mission._ok_events': ( 'pipelines/mission.html#_ok_events',
+                                                                                                           'ids_finder/pipelines/default/mission.py'),
+                                                      'ids_finder.pipelines.default.mission.calc_combined_features': ( 'pipelines/mission.html#calc_combined_features',
                                                                                                                        'ids_finder/pipelines/default/mission.py'),
                                                       'ids_finder.pipelines.default.mission.calc_rotation_angle_pl': ( 'pipelines/mission.html#calc_rotation_angle_pl',
                                                                                                                        'ids_finder/pipelines/default/mission.py'),
@@ -131,6 +360,8 @@ d = { 'settings': { 'branch': 'main',
                                                                                                                   'ids_finder/pipelines/default/mission.py')},
             'ids_finder.pipelines.juno.mag': { 'ids_finder.pipelines.juno.mag._load_func': ( 'missions/juno/mag.html#_load_func',
                                                                                              'ids_finder/pipelines/juno/mag.py'),
+                                               'ids_finder.pipelines.juno.mag.concat_jno_index': ( 'missions/juno/mag.html#concat_jno_index',
+                                                                                                   'ids_finder/pipelines/juno/mag.py'),
                                                'ids_finder.pipelines.juno.mag.create_jno_index_pipeline': ( 'missions/juno/mag.html#create_jno_index_pipeline',
                                                                                                             'ids_finder/pipelines/juno/mag.py'),
                                                'ids_finder.pipelines.juno.mag.create_pipeline': ( 'missions/juno/mag.html#create_pipeline',
@@ -252,6 +483,14 @@ d = { 'settings': { 'branch': 'main',
                                                                                                             'ids_finder/pipelines/wind/pipeline.py')},
             'ids_finder.pipelines.wind.state': { 'ids_finder.pipelines.wind.state.create_pipeline': ( 'missions/wind/state.html#create_pipeline',
                                                                                                       'ids_finder/pipelines/wind/state.py')},
+            'ids_finder.runner': { 'ids_finder.runner.MissionParallelRunner': ('runner.html#missionparallelrunner', 'ids_finder/runner.py'),
+                                   'ids_finder.runner.MissionParallelRunner.__init__': ( 'runner.html#missionparallelrunner.__init__',
+                                                                                         'ids_finder/runner.py'),
+                                   'ids_finder.runner.MissionParallelRunner._run': ( 'runner.html#missionparallelrunner._run',
+                                                                                     'ids_finder/runner.py'),
+                                   'ids_finder.runner.MissionParallelRunner._run_spawned': ( 'runner.html#missionparallelrunner._run_spawned',
+                                                                                             'ids_finder/runner.py'),
+                                   'ids_finder.runner._init_worker': ('runner.html#_init_worker', 'ids_finder/runner.py')},
             'ids_finder.settings': {},
             'ids_finder.utils.analysis': { 'ids_finder.utils.analysis.filter_before_jupiter': ( 'utils/analysis_utils.html#filter_before_jupiter',
                                                                                                 'ids_finder/utils/analysis.py'),
@@ -270,11 +509,13 @@ d = { 'settings': { 'branch': 'main',
                                         'ids_finder.utils.basic.concat_df': ('utils/basic.html#concat_df', 'ids_finder/utils/basic.py'),
                                         'ids_finder.utils.basic.concat_partitions': ( 'utils/basic.html#concat_partitions',
                                                                                       'ids_finder/utils/basic.py'),
+                                        'ids_finder.utils.basic.df2arrays': ('utils/basic.html#df2arrays', 'ids_finder/utils/basic.py'),
                                         'ids_finder.utils.basic.df2ts': ('utils/basic.html#df2ts', 'ids_finder/utils/basic.py'),
                                         'ids_finder.utils.basic.filter_tranges': ( 'utils/basic.html#filter_tranges',
                                                                                    'ids_finder/utils/basic.py'),
                                         'ids_finder.utils.basic.filter_tranges_df': ( 'utils/basic.html#filter_tranges_df',
                                                                                       'ids_finder/utils/basic.py'),
+                                        'ids_finder.utils.basic.format_tau': ('utils/basic.html#format_tau', 'ids_finder/utils/basic.py'),
                                         'ids_finder.utils.basic.format_timedelta': ( 'utils/basic.html#format_timedelta',
                                                                                      'ids_finder/utils/basic.py'),
                                         'ids_finder.utils.basic.get_memory_usage': ( 'utils/basic.html#get_memory_usage',
@@ -308,6 +549,8 @@ d = { 'settings': { 'branch': 'main',
                                        'ids_finder.utils.plot.time_stamp': ('utils/plotting.html#time_stamp', 'ids_finder/utils/plot.py')},
             'ids_finder.utils.polars': { 'ids_finder.utils.polars._expand_selectors': ( 'utils/polars.html#_expand_selectors',
                                                                                         'ids_finder/utils/polars.py'),
+                                         'ids_finder.utils.polars.compose_vector': ( 'utils/polars.html#compose_vector',
+                                                                                     'ids_finder/utils/polars.py'),
                                          'ids_finder.utils.polars.convert_to_pd_dataframe': ( 'utils/polars.html#convert_to_pd_dataframe',
                                                                                               'ids_finder/utils/polars.py'),
                                          'ids_finder.utils.polars.create_partitions': ( 'utils/polars.html#create_partitions',
@@ -315,4 +558,12 @@ d = { 'settings': { 'branch': 'main',
                                          'ids_finder.utils.polars.decompose_vector': ( 'utils/polars.html#decompose_vector',
                                                                                        'ids_finder/utils/polars.py'),
                                          'ids_finder.utils.polars.pl_norm': ('utils/polars.html#pl_norm', 'ids_finder/utils/polars.py'),
-                                         'ids_finder.utils.polars.sort': ('utils/polars.html#sort', 'ids_finder/utils/polars.py')}}}
+                                         'ids_finder.utils.polars.sort': ('utils/polars.html#sort', 'ids_finder/utils/polars.py'),
+                                         'ids_finder.utils.polars.vector_columns': ( 'utils/polars.html#vector_columns',
+                                                                                     'ids_finder/utils/polars.py')},
+            'ids_finder.utils.synthetic': { 'ids_finder.utils.synthetic._random_unit': ( 'utils/synthetic.html#_random_unit',
+                                                                                         'ids_finder/utils/synthetic.py'),
+                                            'ids_finder.utils.synthetic._transition': ( 'utils/synthetic.html#_transition',
+                                                                                        'ids_finder/utils/synthetic.py'),
+                                            'ids_finder.utils.synthetic.synthetic_field': ( 'utils/synthetic.html#synthetic_field',
+                                                                                            'ids_finder/utils/synthetic.py')}}}
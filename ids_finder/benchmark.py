@@ -0,0 +1,138 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../notebooks/21_benchmark.ipynb.
+
+# %% auto 0
+__all__ = ['measure', 'recall', 'benchmark_stages', 'run_benchmark', 'ids_benchmark']
+
+# %% ../notebooks/21_benchmark.ipynb 2
+import time
+import polars as pl
+import numpy as np
+from datetime import timedelta
+from typing import Callable, Literal
+
+from loguru import logger
+from fastcore.script import call_parse, Param
+
+from .core.detection import compute_indices, detect_events
+from .core.propeties import process_events
+from .core.pipeline import ids_finder, compress_data_by_cands
+from .utils.basic import df2arrays
+from .utils.synthetic import synthetic_field
+from .hooks import _reset_peak_rss, _peak_rss
+
+# %% ../notebooks/21_benchmark.ipynb 3
+def measure(func: Callable, *args, **kwargs) -> tuple:
+    """
+    Run `func` and measure its wall time (in seconds) and peak resident set size (in bytes).
+
+    The peak is reset before the run on Linux, otherwise it is the peak of the whole process.
+    """
+    _reset_peak_rss()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    return result, elapsed, _peak_rss()
+
+
+def recall(
+    truth: pl.DataFrame,  # injected discontinuities, with `time`
+    events: pl.DataFrame,  # detected events, with `tstart` and `tstop`
+) -> float:
+    "Fraction of the injected discontinuities inside the window of any event"
+    if truth.is_empty():
+        return float("nan")
+    if events.is_empty():
+        return 0.0
+
+    events = events.sort("tstart")
+    tstart = events["tstart"].to_physical().to_numpy()
+    tstop = np.maximum.accumulate(events["tstop"].to_physical().to_numpy())
+    t = truth["time"].cast(events["tstart"].dtype).to_physical().to_numpy()
+
+    # last window starting before each discontinuity, and the latest stop of the windows up to it
+    i = np.searchsorted(tstart, t, side="right") - 1
+    found = (i >= 0) & (tstop[np.maximum(i, 0)] >= t)
+    return found.mean()
+
+# %% ../notebooks/21_benchmark.ipynb 4
+def benchmark_stages(
+    n: int,  # number of samples of the synthetic data
+    tau: timedelta = timedelta(seconds=60),
+    ts: timedelta = timedelta(seconds=1),
+    method: Literal["join", "grid", "cumsum"] = "join",  # see `compute_indices`
+    event_spacing: int = 2000,  # number of samples between the injected discontinuities
+    seed: int = 0,
+    **kwargs,  # other arguments of `synthetic_field`
+) -> pl.DataFrame:
+    """
+    Time the stages of the pipeline on synthetic data of `n` samples.
+
+    Returns one row per stage with the number of input rows and output rows, wall time, rows per second,
+    peak resident set size and recall of the injected discontinuities.
+    """
+    bcols = ["BX", "BY", "BZ"]
+    data, truth = synthetic_field(
+        n, ts, n_events=max(1, n // event_spacing), bcols=bcols, seed=seed, **kwargs
+    )
+
+    results = []
+
+    def record(stage, output, elapsed, peak_rss, stage_recall=None):
+        results.append(
+            dict(
+                stage=stage,
+                rows=len(data),
+                rows_out=len(output),
+                seconds=elapsed,
+                rows_per_s=len(data) / elapsed,
+                peak_rss_mb=peak_rss / 2**20,
+                recall=stage_recall,
+            )
+        )
+        logger.info(f"{stage}: {len(data)} rows in {elapsed:.3f} s, peak RSS {peak_rss / 2**20:.0f} MB")
+
+    indices, elapsed, peak_rss = measure(compute_indices, data, tau, bcols, method=method)
+    record("compute_indices", indices, elapsed, peak_rss)
+
+    events, elapsed, peak_rss = measure(detect_events, data, tau, ts, bcols, method=method)
+    record("detect_events", events, elapsed, peak_rss, recall(truth, events))
+
+    if not events.is_empty():
+        sat_fgm = df2arrays(compress_data_by_cands(data, events), bcols)
+        ids, elapsed, peak_rss = measure(process_events, events, sat_fgm, ts)
+        record("process_events", ids, elapsed, peak_rss, recall(truth, ids))
+
+        ids, elapsed, peak_rss = measure(ids_finder, data.lazy(), tau, ts, bcols)
+        record("ids_finder", ids, elapsed, peak_rss, recall(truth, ids))
+
+    return pl.DataFrame(results, schema_overrides={"recall": pl.Float64})
+
+
+def run_benchmark(
+    sizes: list[int] = [10**5, 10**6, 10**7, 10**8],  # numbers of samples
+    **kwargs,  # arguments of `benchmark_stages`
+) -> pl.DataFrame:
+    "Benchmark the stages for increasing sizes of the data"
+    return pl.concat([benchmark_stages(n, **kwargs) for n in sizes])
+
+# %% ../notebooks/21_benchmark.ipynb 5
+@call_parse
+def ids_benchmark(
+    sizes: Param("Numbers of samples", int, nargs="+") = [10**5, 10**6, 10**7, 10**8],
+    tau: Param("Window length in seconds", float) = 60,
+    method: Param("Method of `compute_indices`", str, choices=["join", "grid", "cumsum"]) = "join",
+    gap_fraction: Param("Fraction of the samples in data gaps", float) = 0.01,
+    noise: Param("Noise relative to the field magnitude", float) = 0.05,
+    output: Param("Parquet file to save the results", str) = None,
+):
+    "Benchmark the pipeline stages on synthetic data"
+    results = run_benchmark(
+        sizes,
+        tau=timedelta(seconds=tau),
+        method=method,
+        gap_fraction=gap_fraction,
+        noise=noise,
+    )
+    print(results)
+    if output is not None:
+        results.write_parquet(output)
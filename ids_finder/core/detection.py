@@ -1,13 +1,22 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../notebooks/01_ids_detection.ipynb.
 
 # %% auto 0
-__all__ = ['INDEX_STD_THRESHOLD', 'INDEX_FLUC_THRESHOLD', 'INDEX_DIFF_THRESHOLD', 'pl_format_time', 'compute_std',
-           'compute_combinded_std', 'add_neighbor_std', 'compute_index_std', 'compute_index_fluctuation', 'pl_dvec',
-           'compute_index_diff', 'compute_indices', 'filter_indices', 'detect_events']
+__all__ = ['THRESHOLDS', 'pl_format_time', 'compute_std', 'compute_combinded_std', 'time_grid', 'add_neighbor_std',
+           'compute_index_std', 'compute_index_fluctuation', 'pl_dvec', 'compute_index_diff', 'compute_block_stats',
+           'compute_indices_from_blocks', 'compute_window_stats', 'compute_indices', 'DetectionThresholds',
+           'filter_indices', 'compute_indices_cached', 'sweep_thresholds', 'block_length', 'compute_multi_tau_indices',
+           'detect_events', 'detect_events_from_blocks', 'compute_block_stats_lazy', 'dense_block_stats',
+           'detect_events_lazy']
 
 # %% ../../notebooks/01_ids_detection.ipynb 3
-from datetime import timedelta
+import math
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Literal
 import polars as pl
+import numpy as np
+import xarray as xr
+from pathlib import Path
 
 from fastcore.utils import *
 from fastcore.test import *
@@ -26,6 +35,19 @@ def pl_format_time(df: pl.LazyFrame | pl.DataFrame, tau: timedelta):
         time=(pl.col("time") + tau / 2),
     )
 
+
+def _time_to_int(td: timedelta, time_unit: str) -> int:
+    "Convert `timedelta` to an integer in the given `time_unit` of a `pl.Datetime`"
+    match time_unit:
+        case "ns":
+            return td // timedelta(microseconds=1) * 1000
+        case "us":
+            return td // timedelta(microseconds=1)
+        case "ms":
+            return td // timedelta(milliseconds=1)
+        case _:
+            raise ValueError(f"Unsupported time unit: {time_unit}")
+
 # %% ../../notebooks/01_ids_detection.ipynb 6
 def compute_std(
     df: pl.DataFrame | pl.LazyFrame,
@@ -90,8 +112,63 @@ def compute_combinded_std(df: pl.DataFrame | pl.LazyFrame, tau, cols) -> pl.Data
     return combined_std_df
 
 # %% ../../notebooks/01_ids_detection.ipynb 8
+def time_grid(
+    df: pl.DataFrame | pl.LazyFrame,
+    every: timedelta,  # slot length
+) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Place the rows on a dense grid of time slots.
+
+    Each row goes to the slot `time // every` (at most one row per slot, like the windows of `group_by_dynamic`).
+    The grid has one row per slot from the first to the last one, and missing slots are explicit nulls,
+    so that neighbors are fixed offsets on the grid.
+
+    A `pl.LazyFrame` stays lazy: the grid is a `pl.datetime_range` left-joined with the rows.
+    """
+    if isinstance(df, pl.LazyFrame):
+        time_unit = df.schema["time"].time_unit
+        slots = df.select(
+            pl.datetime_range(
+                pl.col("time").min().dt.truncate(every), pl.col("time").max(), every, time_unit=time_unit
+            ).alias("time")
+        )
+        rows = df.with_columns(pl.col("time").dt.truncate(every))
+        return slots.join(rows, on="time", how="left").select(df.columns)
+
+    time_unit = df["time"].dtype.time_unit
+    every_int = _time_to_int(every, time_unit)
+
+    slot = df["time"].to_physical().to_numpy() // every_int
+    slots = np.arange(slot.min(), slot.max() + 1)
+    index = np.full(len(slots), -1)
+    index[slot - slots[0]] = np.arange(len(df))
+    index = pl.Series(index)
+
+    return df.select(
+        pl.all().gather(pl.when(index >= 0).then(index)),
+    ).with_columns(
+        time=pl.Series(slots * every_int).cast(pl.Datetime(time_unit)),
+    )
+
+
+def _grid_neighbor_std(grid: pl.DataFrame, offset: int = 2) -> pl.DataFrame:
+    "Previous and next windows are `offset` slots away (`tau` for slots of `tau / 2`)"
+    return grid.with_columns(
+        B_std_prev=pl.col("B_std").shift(offset),
+        count_prev=pl.col("count").shift(offset),
+        B_std_next=pl.col("B_std").shift(-offset),
+        count_next=pl.col("count").shift(-offset),
+    )
+
+
+def _drop_missing_windows(grid: pl.DataFrame, join_strategy="inner") -> pl.DataFrame:
+    "Drop the empty slots, and the windows without neighbors for the `inner` strategy"
+    columns = ["count", "count_prev", "count_next"] if join_strategy == "inner" else ["count"]
+    return grid.drop_nulls(columns)
+
+
 def add_neighbor_std(
-    df: pl.LazyFrame, tau: timedelta, join_strategy="inner"
+    df: pl.DataFrame | pl.LazyFrame, tau: timedelta, join_strategy="inner"
 ):  # noqa: F811
     """
     Get the neighbor standard deviations
@@ -100,31 +177,20 @@ def add_neighbor_std(
     ----------
     - df (pl.LazyFrame): The input DataFrame.
     - tau : The time interval value.
+    - join_strategy : "inner" keeps only windows with both neighbors, "left" keeps all windows.
 
     Notes
     -----
     Simply shift would not work correctly if data is missing, like `std_next = pl.col("B_std").shift(-2)`.
-
+    So the windows are first placed on a dense `tau / 2` grid (`time_grid`), where missing windows are nulls.
     """
-
-    # Calculate the standard deviation index
-    prev_std_df = df.select(
-        pl.col("time") + tau,
-        B_std_prev=pl.col("B_std"),
-        count_prev=pl.col("count"),
+    return (
+        time_grid(df, tau / 2)
+        .pipe(_grid_neighbor_std)
+        .pipe(_drop_missing_windows, join_strategy)
     )
 
-    next_std_df = df.select(
-        pl.col("time") - tau,
-        B_std_next=pl.col("B_std"),
-        count_next=pl.col("count"),
-    )
-
-    return df.join(prev_std_df, on="time", how=join_strategy).join(
-        next_std_df, on="time", how=join_strategy
-    )
-
-# %% ../../notebooks/01_ids_detection.ipynb 9
+# %% ../../notebooks/01_ids_detection.ipynb 10
 def compute_index_std(df: pl.LazyFrame):  # noqa: F811
     """
     Compute the standard deviation index based on the given DataFrame
@@ -147,13 +213,13 @@ def compute_index_std(df: pl.LazyFrame):  # noqa: F811
         index_std=pl.col("B_std") / pl.max_horizontal("B_std_prev", "B_std_next"),
     )
 
-# %% ../../notebooks/01_ids_detection.ipynb 11
+# %% ../../notebooks/01_ids_detection.ipynb 12
 def compute_index_fluctuation(df: pl.LazyFrame, base_col="B_std"):
     std_combined = pl.col("B_std_combined")
     std_added = pl.sum_horizontal("B_std_prev", "B_std_next")
     return df.with_columns(index_fluctuation=std_combined / std_added)
 
-# %% ../../notebooks/01_ids_detection.ipynb 13
+# %% ../../notebooks/01_ids_detection.ipynb 14
 def pl_dvec(columns, *more_columns):
     all_columns = _expand_selectors(columns, *more_columns)
     return [
@@ -161,7 +227,7 @@ def pl_dvec(columns, *more_columns):
         for column in all_columns
     ]
 
-# %% ../../notebooks/01_ids_detection.ipynb 14
+# %% ../../notebooks/01_ids_detection.ipynb 15
 def compute_index_diff(df: pl.LazyFrame, period: timedelta, cols):
     db_cols = ["d" + col + "_vec" for col in cols]
 
@@ -179,7 +245,298 @@ def compute_index_diff(df: pl.LazyFrame, period: timedelta, cols):
 
     return index_diff
 
-# %% ../../notebooks/01_ids_detection.ipynb 15
+# %% ../../notebooks/01_ids_detection.ipynb 17
+def _cumsum0(x: np.ndarray) -> np.ndarray:
+    "Cumulative sum along the first axis, with a leading zero"
+    out = np.zeros((len(x) + 1,) + x.shape[1:], dtype=np.float64)
+    np.cumsum(x, axis=0, out=out[1:])
+    return out
+
+# %% ../../notebooks/01_ids_detection.ipynb 18
+def compute_block_stats(
+    df: pl.DataFrame,
+    every: timedelta,  # block length, usually `tau / 2`
+    cols: list[str] = ["BX", "BY", "BZ"],
+) -> pl.DataFrame:
+    """
+    Compute the statistics of every block of length `every` in one sorted scan.
+
+    Blocks are aligned to the epoch (like `group_by_dynamic`) and the returned grid is dense:
+    empty blocks are kept with `count = 0`.
+
+    Returns
+    -------
+    pl.DataFrame with columns
+        - `time`: start of the block
+        - `count`: number of samples
+        - `B_count`, `B_sum`: number and sum of the valid field magnitudes
+        - `{col}_count`, `{col}_mean`, `{col}_m2`: number of valid samples, mean and sum of squared deviations
+        - `{col}_first`, `{col}_last`: first and last samples
+
+    Notes
+    -----
+    Each block is centered on its first sample before taking the cumulative sums,
+    so that the sums of squares do not lose precision over a whole partition.
+    """
+    if isinstance(df, pl.LazyFrame):
+        df = df.collect()
+
+    time = df["time"]
+    time_unit = time.dtype.time_unit
+    every_int = _time_to_int(every, time_unit)
+
+    t = time.to_physical().to_numpy()
+    vec = df.select(cols).to_numpy().astype(np.float64)
+
+    blocks = np.arange(t[0] // every_int, t[-1] // every_int + 1)
+    bounds = np.searchsorted(t, np.append(blocks, blocks[-1] + 1) * every_int)
+    starts, stops = bounds[:-1], bounds[1:]
+    count = stops - starts
+    nonempty = count > 0
+
+    first = np.full((len(blocks), len(cols)), np.nan)
+    last = np.full((len(blocks), len(cols)), np.nan)
+    first[nonempty] = vec[starts[nonempty]]
+    last[nonempty] = vec[stops[nonempty] - 1]
+
+    valid = ~np.isnan(vec)
+    ref = np.nan_to_num(first)
+    centered = np.where(valid, vec - np.repeat(ref, count, axis=0), 0.0)
+
+    n = np.diff(_cumsum0(valid)[bounds], axis=0)
+    s = np.diff(_cumsum0(centered)[bounds], axis=0)
+    q = np.diff(_cumsum0(centered**2)[bounds], axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = ref + s / n
+        m2 = np.maximum(q - s**2 / n, 0.0)
+
+    b = np.linalg.norm(vec, axis=1)
+    b_valid = ~np.isnan(b)
+    b_count = np.diff(_cumsum0(b_valid)[bounds])
+    b_sum = np.diff(_cumsum0(np.where(b_valid, b, 0.0))[bounds])
+
+    columns = {
+        "time": pl.Series(blocks * every_int).cast(pl.Datetime(time_unit)),
+        "count": count.astype(np.uint32),
+        "B_count": b_count.astype(np.uint32),
+        "B_sum": b_sum,
+    }
+    for i, col in enumerate(cols):
+        columns[f"{col}_count"] = n[:, i].astype(np.uint32)
+        columns[f"{col}_mean"] = mean[:, i]
+        columns[f"{col}_m2"] = m2[:, i]
+        columns[f"{col}_first"] = first[:, i]
+        columns[f"{col}_last"] = last[:, i]
+
+    return pl.DataFrame(columns).with_columns(pl.col(pl.Float64).fill_nan(None))
+
+# %% ../../notebooks/01_ids_detection.ipynb 19
+def _combine_moments(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+    "Combine counts, means and sums of squared deviations of two sets of samples (Chan et al.)"
+    n = n_a + n_b
+    with np.errstate(invalid="ignore", divide="ignore"):
+        frac = np.where(n > 0, n_b / n, 0.0)
+    delta = mean_b - mean_a
+    return n, mean_a + delta * frac, m2_a + m2_b + delta**2 * n_a * frac
+
+
+def _window_moments(n, mean, m2, width: int):
+    "Moments of every `width` consecutive blocks"
+    size = len(n) - width + 1
+    moments = n[:size], mean[:size], m2[:size]
+    for i in range(1, width):
+        moments = _combine_moments(
+            *moments, n[i : i + size], mean[i : i + size], m2[i : i + size]
+        )
+    return moments
+
+
+def _moments_std(n, m2) -> np.ndarray:
+    "Norm of the (ddof=0) standard deviations of the components"
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.sqrt((m2 / n).sum(axis=1))
+
+
+def _ffill_index(mask: np.ndarray) -> np.ndarray:
+    "Index of the last `True` at or before each position"
+    return np.maximum.accumulate(np.where(mask, np.arange(len(mask)), 0))
+
+
+def _bfill_index(mask: np.ndarray) -> np.ndarray:
+    "Index of the first `True` at or after each position"
+    index = np.where(mask, np.arange(len(mask)), len(mask) - 1)
+    return np.minimum.accumulate(index[::-1])[::-1]
+
+# %% ../../notebooks/01_ids_detection.ipynb 20
+def compute_indices_from_blocks(
+    blocks: pl.DataFrame,  # output of `compute_block_stats`
+    tau: timedelta,
+    cols: list[str] = ["BX", "BY", "BZ"],
+    every: timedelta = None,  # block length of `blocks` (default: tau / 2)
+) -> pl.DataFrame:
+    """
+    Compute all indices from the block statistics.
+
+    Windows of length `tau` start every `tau / 2`, so each window spans `tau / every` blocks.
+    Previous and next windows are the windows shifted by `tau` on the dense block grid,
+    and only windows where all three of them contain data are kept (as the inner joins in `_compute_indices`).
+    """
+    if every is None:
+        every = tau / 2
+    if (tau / 2) % every:
+        raise ValueError(f"tau / 2 ({tau / 2}) must be a multiple of the block length ({every})")
+    step = (tau / 2) // every  # number of blocks per tau / 2
+    width = 2 * step  # number of blocks per window
+
+    time_unit = blocks["time"].dtype.time_unit
+    every_int = _time_to_int(every, time_unit)
+
+    def to_numpy(names, fill_value=0.0):
+        # pad with empty blocks so that neighbors of the edge windows exist
+        values = blocks.select(names).fill_null(fill_value).to_numpy().astype(np.float64)
+        return np.pad(values, ((width, width), (0, 0)), constant_values=fill_value)
+
+    block_index = blocks["time"].to_physical().to_numpy() // every_int
+    block_index = np.arange(len(blocks) + 2 * width) + block_index[0] - width
+
+    count = to_numpy("count")[:, 0]
+    b_count = to_numpy("B_count")[:, 0]
+    b_sum = to_numpy("B_sum")[:, 0]
+    n = to_numpy([f"{col}_count" for col in cols])
+    mean = to_numpy([f"{col}_mean" for col in cols])
+    m2 = to_numpy([f"{col}_m2" for col in cols])
+    # a missing first or last sample gives a missing `dB_vec`, as `pl_dvec`
+    first = to_numpy([f"{col}_first" for col in cols], np.nan)
+    last = to_numpy([f"{col}_last" for col in cols], np.nan)
+
+    def window_sum(x):
+        c = _cumsum0(x)
+        return c[width:] - c[:-width]
+
+    count_w = window_sum(count)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        b_mean_w = window_sum(b_sum) / window_sum(b_count)
+    n_w, mean_w, m2_w = _window_moments(n, mean, m2, width)
+
+    # windows start at multiples of tau / 2
+    i = np.arange(width, len(count_w) - width)
+    i = i[block_index[i] % step == 0]
+    i_prev, i_next = i - width, i + width
+    available = (count_w[i] > 0) & (count_w[i_prev] > 0) & (count_w[i_next] > 0)
+    i, i_prev, i_next = i[available], i_prev[available], i_next[available]
+
+    std = _moments_std(n_w[i], m2_w[i])
+    std_prev = _moments_std(n_w[i_prev], m2_w[i_prev])
+    std_next = _moments_std(n_w[i_next], m2_w[i_next])
+    n_c, _, m2_c = _combine_moments(
+        n_w[i_prev], mean_w[i_prev], m2_w[i_prev], n_w[i_next], mean_w[i_next], m2_w[i_next]
+    )
+    std_combined = _moments_std(n_c, m2_c)
+
+    nonempty = count > 0
+    vec_first = first[_bfill_index(nonempty)[i]]
+    vec_last = last[_ffill_index(nonempty)[i + width - 1]]
+    db_vec = np.linalg.norm(vec_first - vec_last, axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return pl.DataFrame(
+            {
+                "time": pl.Series(block_index[i] * every_int).cast(pl.Datetime(time_unit)),
+                "count": count_w[i].astype(np.uint32),
+                "B_std": std,
+                "count_prev": count_w[i_prev].astype(np.uint32),
+                "count_next": count_w[i_next].astype(np.uint32),
+                "B_mean": b_mean_w[i],
+                "dB_vec": db_vec,
+                "index_diff": db_vec / b_mean_w[i],
+                "index_std": std / np.maximum(std_prev, std_next),
+                "index_fluctuation": std_combined / (std_prev + std_next),
+            }
+        ).with_columns(pl.col("dB_vec", "index_diff").fill_nan(None))
+
+
+def _compute_indices_cumsum(
+    df: pl.DataFrame, tau: timedelta, cols: list[str] = ["BX", "BY", "BZ"]
+) -> pl.DataFrame:
+    blocks = compute_block_stats(df, tau / 2, cols)
+    return compute_indices_from_blocks(blocks, tau, cols)
+
+# %% ../../notebooks/01_ids_detection.ipynb 22
+def compute_window_stats(
+    df: pl.DataFrame | pl.LazyFrame,
+    period: timedelta,
+    cols: list[str] = ["BX", "BY", "BZ"],
+    every: timedelta = None,  # default: period / 2
+) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Compute the statistics of every window in one `group_by_dynamic` pass.
+
+    Besides `count`, `B_std`, `B_mean` and `dB_vec`, the number of valid samples, mean and (ddof=0) variance
+    of each component are kept (`{col}_count`, `{col}_mean`, `{col}_var`) to combine neighboring windows.
+    """
+    if every is None:
+        every = period / 2
+    db_cols = ["d" + col + "_vec" for col in cols]
+    var_cols = [col + "_var" for col in cols]
+
+    return (
+        df.with_columns(B=pl_norm(cols))
+        .group_by_dynamic("time", every=every, period=period)
+        .agg(
+            pl.count(),
+            pl.col(cols).is_not_null().sum().map_alias(lambda col_name: col_name + "_count"),
+            pl.col(cols).mean().map_alias(lambda col_name: col_name + "_mean"),
+            pl.col(cols).var(ddof=0).map_alias(lambda col_name: col_name + "_var"),
+            pl.col("B").mean().alias("B_mean"),
+            *pl_dvec(cols),
+        )
+        .with_columns(
+            B_std=sum(pl.col(col) for col in var_cols).sqrt(),
+            dB_vec=pl_norm(db_cols),
+        )
+        .drop(db_cols)
+    )
+
+
+def _grid_combined_std(
+    grid: pl.DataFrame, cols: list[str], offset: int = 2
+) -> pl.DataFrame:
+    "Standard deviation of the previous and next windows taken together, from their moments"
+    variances = []
+    for col in cols:
+        n_prev = pl.col(f"{col}_count").shift(offset).cast(pl.Float64)
+        n_next = pl.col(f"{col}_count").shift(-offset).cast(pl.Float64)
+        mean_prev = pl.col(f"{col}_mean").shift(offset)
+        mean_next = pl.col(f"{col}_mean").shift(-offset)
+        var_prev = pl.col(f"{col}_var").shift(offset)
+        var_next = pl.col(f"{col}_var").shift(-offset)
+        n = n_prev + n_next
+        variances.append(
+            (n_prev * var_prev + n_next * var_next) / n
+            + n_prev * n_next * (mean_prev - mean_next).pow(2) / n.pow(2)
+        )
+    return grid.with_columns(B_std_combined=sum(variances).sqrt())
+
+
+def _compute_indices_grid(
+    df: pl.DataFrame | pl.LazyFrame, tau: timedelta, cols: list[str] = ["BX", "BY", "BZ"]
+) -> pl.DataFrame:
+    return (
+        compute_window_stats(df, tau, cols)
+        .pipe(time_grid, tau / 2)
+        .pipe(_grid_neighbor_std)
+        .pipe(_grid_combined_std, cols)
+        .pipe(_drop_missing_windows)
+        .with_columns(index_diff=pl.col("dB_vec") / pl.col("B_mean"))
+        .pipe(compute_index_std)
+        .pipe(compute_index_fluctuation)
+        .select(
+            "time", "count", "B_std", "count_prev", "count_next", "B_mean", "dB_vec",
+            "index_diff", "index_std", "index_fluctuation",
+        )
+    )
+
+# %% ../../notebooks/01_ids_detection.ipynb 23
 def _compute_indices(
     df: pl.LazyFrame, tau: timedelta, cols: list[str] = ["BX", "BY", "BZ"]
 ) -> pl.LazyFrame:
@@ -203,7 +560,10 @@ def _compute_indices(
 
 
 def compute_indices(
-    df: pl.DataFrame, tau: timedelta, bcols: list[str] = ["BX", "BY", "BZ"]
+    df: pl.DataFrame,
+    tau: timedelta,
+    bcols: list[str] = ["BX", "BY", "BZ"],
+    method: Literal["join", "grid", "cumsum"] = "join",
 ) -> pl.DataFrame:
     """
     Compute all index based on the given DataFrame and tau value.
@@ -214,6 +574,10 @@ def compute_indices(
         Input DataFrame.
     tau : datetime.timedelta
         Time interval value.
+    method : str
+        - "join": group the data for each index and join the results on `time` (`_compute_indices`).
+        - "grid": group the data once and look up the neighboring windows on a dense `tau/2` grid (`_compute_indices_grid`).
+        - "cumsum": derive all indices from the `tau/2` block statistics (`_compute_indices_cumsum`).
 
     Returns
     -------
@@ -228,50 +592,355 @@ def compute_indices(
     Notes
     -----
     - This is a wrapper for `_compute_indices` with `pl.LazyFrame` input.
+    - All methods give the same columns. The "grid" and "cumsum" methods scan the data once
+        and avoid the joins, which is faster and uses less memory for large partitions.
     - Simply shift to calculate index_std would not work correctly if data is missing,
-        like `std_next = pl.col("B_std").shift(-2)`.
+        like `std_next = pl.col("B_std").shift(-2)`, unless the windows are on a dense grid (see `time_grid`).
     - Drop null though may lose some IDs (using the default `join_strategy`).
         Because we could not tell if it is a real ID or just a partial wave
         from incomplete data without previous or/and next std.
         Hopefully we can pick up the lost ones with smaller tau.
-    - TODO: Can be optimized further, but this is already fast enough.
-        - TEST: if `join` can be improved by shift after filling the missing values.
-        - TEST: if `list` in `polars` really fast?
     """
-    return _compute_indices(df.lazy(), tau, bcols).collect()
-
-# %% ../../notebooks/01_ids_detection.ipynb 17
+    match method:
+        case "join":
+            return _compute_indices(df.lazy(), tau, bcols).collect()
+        case "grid":
+            return _compute_indices_grid(df, tau, bcols)
+        case "cumsum":
+            return _compute_indices_cumsum(df, tau, bcols)
+        case _:
+            raise ValueError(f"Unknown method: {method}")
+
+# %% ../../notebooks/01_ids_detection.ipynb 28
 from .. import PARAMS
+from pydantic import BaseModel
 
-INDEX_STD_THRESHOLD = PARAMS['detection']['index_std_threshold']
-INDEX_FLUC_THRESHOLD = PARAMS['detection']['index_fluc_threshold']
-INDEX_DIFF_THRESHOLD = PARAMS['detection']['index_diff_threshold']
 
-# %% ../../notebooks/01_ids_detection.ipynb 18
+class DetectionThresholds(BaseModel, extra="forbid"):
+    """
+    Thresholds of the indices to select the candidate events, see `filter_indices`
+
+    Read from `detection.thresholds` in the parameters, where an unknown name (like a typo) is an error.
+    """
+    index_std_threshold: float = 2
+    index_fluc_threshold: float = 1
+    index_diff_threshold: float = 0.1
+
+
+THRESHOLDS = DetectionThresholds(**PARAMS["detection"].get("thresholds", {}))
+
+# %% ../../notebooks/01_ids_detection.ipynb 30
 def filter_indices(
     df: pl.DataFrame | pl.LazyFrame,
-    index_std_threshold : float = INDEX_STD_THRESHOLD,
-    index_fluc_threshold : float =INDEX_FLUC_THRESHOLD,
-    index_diff_threshold : float =INDEX_DIFF_THRESHOLD,
+    thresholds: DetectionThresholds = THRESHOLDS,
     sparse_num : int =15,
 ) -> pl.DataFrame | pl.LazyFrame:
     # filter indices to get possible IDs
 
     return df.filter(
-        pl.col("index_std") > index_std_threshold,
-        pl.col("index_fluctuation") > index_fluc_threshold,
-        pl.col("index_diff") > index_diff_threshold,
+        pl.col("index_std") > thresholds.index_std_threshold,
+        pl.col("index_fluctuation") > thresholds.index_fluc_threshold,
+        pl.col("index_diff") > thresholds.index_diff_threshold,
         pl.col("index_std").is_finite(), # for cases where neighboring groups have std=0
         pl.col("count") > sparse_num, 
         pl.col("count_prev") > sparse_num, # filter out sparse intervals, which may give unreasonable results.
         pl.col("count_next") > sparse_num # filter out sparse intervals, which may give unreasonable results.
     ).drop(["count_prev", "count_next"])
 
-# %% ../../notebooks/01_ids_detection.ipynb 19
-def detect_events(data: pl.DataFrame, tau: timedelta, ts: timedelta, bcols):
-    indices = compute_indices(data, tau, bcols)
+# %% ../../notebooks/01_ids_detection.ipynb 32
+def compute_indices_cached(
+    df: pl.DataFrame,
+    tau: timedelta,
+    bcols: list[str],
+    path: str | Path,  # parquet file of the cached indices
+    method: Literal["join", "grid", "cumsum"] = "cumsum",
+    overwrite: bool = False,
+) -> pl.DataFrame:
+    "`compute_indices`, with the unfiltered indices cached in `path` so that the thresholds can be tuned without the raw data"
+    path = Path(path)
+    if path.exists() and not overwrite:
+        return pl.read_parquet(path)
+
+    indices = compute_indices(df, tau, bcols, method=method)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    indices.write_parquet(path)
+    return indices
+
+
+def _threshold_counts(
+    indices: pl.DataFrame | pl.LazyFrame,
+    grids: list[np.ndarray],  # sorted thresholds of each index
+    sparse_num: int,
+) -> np.ndarray:
+    "Number of candidates for every combination of the thresholds, in one pass over the indices"
+    index_cols = ["index_std", "index_fluctuation", "index_diff"]
+    values = (
+        indices.lazy()
+        .filter(
+            pl.col("index_std").is_finite(),
+            pl.col("count") > sparse_num,
+            pl.col("count_prev") > sparse_num,
+            pl.col("count_next") > sparse_num,
+        )
+        .select(index_cols)
+        .collect()
+    )
+
+    # number of thresholds of each index that a candidate exceeds (NaN exceeds none)
+    bins = [
+        np.where(np.isnan(v), 0, np.searchsorted(grid, v, side="left"))
+        for grid, v in zip(grids, values.to_numpy().T)
+    ]
+    shape = [len(grid) + 1 for grid in grids]
+    counts = np.bincount(
+        np.ravel_multi_index(bins, shape), minlength=np.prod(shape)
+    ).reshape(shape)
+
+    # a candidate of bin `i` passes thresholds `0, ..., i - 1`: sum the bins above each threshold
+    for axis in range(counts.ndim):
+        counts = np.flip(np.cumsum(np.flip(counts, axis), axis=axis), axis)
+    return counts[1:, 1:, 1:]
+
+
+def sweep_thresholds(
+    indices: dict[str, pl.DataFrame | pl.LazyFrame],  # unfiltered indices of each satellite, like `compute_indices_cached`
+    index_std_thresholds: list[float],
+    index_fluc_thresholds: list[float],
+    index_diff_thresholds: list[float],
+    sparse_num: int = 15,
+) -> xr.DataArray:
+    """
+    Count the candidates of every combination of the thresholds, for every satellite.
+
+    This is the number of rows `filter_indices` would keep with `DetectionThresholds` of each combination,
+    but each satellite's indices are only read once (only the needed columns, so `pl.scan_parquet` works well).
+
+    Returns a `xr.DataArray` of dimensions (`sat`, `index_std_threshold`, `index_fluc_threshold`, `index_diff_threshold`).
+    """
+    grids = [
+        np.sort(np.asarray(thresholds, dtype=np.float64))
+        for thresholds in [index_std_thresholds, index_fluc_thresholds, index_diff_thresholds]
+    ]
+    counts = [
+        _threshold_counts(sat_indices, grids, sparse_num)
+        for sat_indices in indices.values()
+    ]
+    return xr.DataArray(
+        np.stack(counts),
+        dims=["sat", *DetectionThresholds.__fields__],
+        coords={"sat": list(indices.keys()), **dict(zip(DetectionThresholds.__fields__, grids))},
+        name="count",
+    )
+
+# %% ../../notebooks/01_ids_detection.ipynb 34
+def _gcd_timedelta(tds: list[timedelta]) -> timedelta:
+    return timedelta(
+        microseconds=math.gcd(*(td // timedelta(microseconds=1) for td in tds))
+    )
+
+
+def block_length(tau: timedelta | list[timedelta]) -> timedelta:
+    "Largest block length dividing every `tau / 2`, see `compute_block_stats`"
+    if isinstance(tau, timedelta):
+        return tau / 2
+    return _gcd_timedelta([_tau / 2 for _tau in tau])
+
+
+def compute_multi_tau_indices(
+    df: pl.DataFrame,
+    taus: list[timedelta],
+    bcols: list[str] = ["BX", "BY", "BZ"],
+) -> dict[timedelta, pl.DataFrame]:
+    """
+    Compute the indices for multiple `tau` values in one pass over the data.
+
+    The block statistics are computed once, with the largest block length dividing every `tau / 2`
+    (`tau_min / 2` when all `tau` are multiples of the smallest one), and aggregated up for each `tau`.
+    """
+    every = block_length(taus)
+    blocks = compute_block_stats(df, every, bcols)
+    return {
+        tau: compute_indices_from_blocks(blocks, tau, bcols, every=every)
+        for tau in taus
+    }
+
+# %% ../../notebooks/01_ids_detection.ipynb 36
+def _indices_to_events(
+    indices: pl.DataFrame,
+    tau: timedelta,
+    ts: timedelta,
+    thresholds: DetectionThresholds = THRESHOLDS,
+):
     sparse_num = tau / ts // 3
-    events = indices.pipe(filter_indices, sparse_num=sparse_num).pipe(
+    return indices.pipe(filter_indices, thresholds, sparse_num=sparse_num).pipe(
         pl_format_time, tau
     )
-    return events
+
+
+def detect_events(
+    data: pl.DataFrame,
+    tau: timedelta | list[timedelta],
+    ts: timedelta,
+    bcols,
+    method: Literal["join", "grid", "cumsum"] = "join",  # see `compute_indices`
+    thresholds: DetectionThresholds = THRESHOLDS,
+):
+    """
+    Detect the candidate events
+
+    For multiple `tau` values, the block statistics are shared (see `compute_multi_tau_indices`)
+    and the events of every `tau` are concatenated with a `tau` column.
+    """
+    if isinstance(tau, timedelta):
+        indices = compute_indices(data, tau, bcols, method=method)
+        return _indices_to_events(indices, tau, ts, thresholds)
+
+    events = [
+        _indices_to_events(indices, _tau, ts, thresholds).with_columns(tau=pl.lit(_tau))
+        for _tau, indices in compute_multi_tau_indices(data, tau, bcols).items()
+    ]
+    return pl.concat(events)
+
+
+def detect_events_from_blocks(
+    blocks: pl.DataFrame,  # output of `compute_block_stats`
+    tau: timedelta | list[timedelta],
+    ts: timedelta,
+    bcols,
+    every: timedelta = None,  # block length of `blocks` (default: `block_length(tau)`)
+    thresholds: DetectionThresholds = THRESHOLDS,
+):
+    "Detect the candidate events from the block statistics, like `detect_events` with the `cumsum` method"
+    if every is None:
+        every = block_length(tau)
+
+    if isinstance(tau, timedelta):
+        indices = compute_indices_from_blocks(blocks, tau, bcols, every=every)
+        return _indices_to_events(indices, tau, ts, thresholds)
+
+    events = [
+        _indices_to_events(
+            compute_indices_from_blocks(blocks, _tau, bcols, every=every), _tau, ts, thresholds
+        ).with_columns(tau=pl.lit(_tau))
+        for _tau in tau
+    ]
+    return pl.concat(events)
+
+# %% ../../notebooks/01_ids_detection.ipynb 38
+def _block_stats_schema(time_dtype: pl.DataType, cols: list[str]) -> dict:
+    "Schema of `compute_block_stats`"
+    schema = {"time": time_dtype, "count": pl.UInt32, "B_count": pl.UInt32, "B_sum": pl.Float64}
+    for col in cols:
+        schema[f"{col}_count"] = pl.UInt32
+        for stat in ["mean", "m2", "first", "last"]:
+            schema[f"{col}_{stat}"] = pl.Float64
+    return schema
+
+
+def _batch_block_stats(batch: pl.DataFrame, every: timedelta, cols: list[str], schema: dict):
+    "Block statistics of a batch of the data, with the start of the batch to order the blocks split between batches"
+    if batch.is_empty():
+        return pl.DataFrame(schema=schema)
+    batch = batch.sort("time")
+    return (
+        compute_block_stats(batch, every, cols)
+        .filter(pl.col("count") > 0)
+        .with_columns(batch_start=pl.lit(batch["time"][0]))
+    )
+
+
+def _merge_block_stats(a: dict, b: dict, cols: list[str]) -> dict:
+    "Merge the statistics of the two parts of a block, `a` before `b`"
+    merged = {
+        "time": a["time"],
+        "count": a["count"] + b["count"],
+        "B_count": a["B_count"] + b["B_count"],
+        "B_sum": (a["B_sum"] or 0.0) + (b["B_sum"] or 0.0),
+    }
+    for col in cols:
+        n_a, n_b = a[f"{col}_count"], b[f"{col}_count"]
+        if n_a == 0 or n_b == 0:
+            valid = b if n_a == 0 else a
+            n, mean, m2 = n_a + n_b, valid[f"{col}_mean"], valid[f"{col}_m2"]
+        else:
+            n, mean, m2 = _combine_moments(
+                n_a, a[f"{col}_mean"], a[f"{col}_m2"], n_b, b[f"{col}_mean"], b[f"{col}_m2"]
+            )
+        merged[f"{col}_count"] = n
+        merged[f"{col}_mean"] = float(mean) if mean is not None else None
+        merged[f"{col}_m2"] = float(m2) if m2 is not None else None
+        merged[f"{col}_first"] = a[f"{col}_first"]
+        merged[f"{col}_last"] = b[f"{col}_last"]
+    return merged
+
+
+def compute_block_stats_lazy(
+    ldata: pl.LazyFrame,
+    every: timedelta,  # block length, usually `tau / 2`
+    cols: list[str] = ["BX", "BY", "BZ"],
+    streaming: bool = True,
+) -> pl.DataFrame:
+    """
+    Compute the block statistics of `compute_block_stats` without materializing the data.
+
+    Only `time` and `cols` are read (projection pushdown), and each batch of Polars' streaming engine is reduced
+    to its block statistics. The few blocks split between two batches are merged afterwards.
+    As for `compute_block_stats`, the data is assumed to be sorted by time (at least across the batches).
+    """
+    ldata = ldata.select("time", *cols)
+    schema = _block_stats_schema(ldata.schema["time"], cols)
+
+    partials = (
+        ldata.map_batches(
+            partial(_batch_block_stats, every=every, cols=cols, schema=schema),
+            schema=schema | {"batch_start": ldata.schema["time"]},
+            streamable=True,
+        )
+        .collect(streaming=streaming)
+        .sort(["time", "batch_start"])
+        .drop("batch_start")
+    )
+
+    split = partials["time"].is_duplicated()
+    if split.any():
+        merged = []
+        for _, parts in partials.filter(split).group_by("time", maintain_order=True):
+            rows = parts.iter_rows(named=True)
+            block = next(rows)
+            for row in rows:
+                block = _merge_block_stats(block, row, cols)
+            merged.append(block)
+        partials = pl.concat(
+            [partials.filter(~split), pl.DataFrame(merged, schema=schema)]
+        ).sort("time")
+
+    return dense_block_stats(partials, every, cols)
+
+
+def dense_block_stats(
+    blocks: pl.DataFrame,  # blocks with data, like the output of `compute_block_stats` without the empty blocks
+    every: timedelta,
+    cols: list[str] = ["BX", "BY", "BZ"],
+) -> pl.DataFrame:
+    "Fill the missing blocks (see `time_grid`), as returned by `compute_block_stats`"
+    count_cols = ["count", "B_count"] + [f"{col}_count" for col in cols]
+    return time_grid(blocks, every).with_columns(pl.col(count_cols).fill_null(0))
+
+
+def detect_events_lazy(
+    ldata: pl.LazyFrame,
+    tau: timedelta | list[timedelta],
+    ts: timedelta,
+    bcols,
+    thresholds: DetectionThresholds = THRESHOLDS,
+    streaming: bool = True,
+) -> pl.DataFrame:
+    """
+    Detect the candidate events without materializing the data.
+
+    Only the block statistics (about `tau / 2 / ts` times fewer rows than the data) are kept in memory
+    (see `compute_block_stats_lazy`), then the events are detected as in `detect_events_from_blocks`.
+    """
+    every = block_length(tau)
+    blocks = compute_block_stats_lazy(ldata, every, bcols, streaming=streaming)
+    return detect_events_from_blocks(blocks, tau, ts, bcols, every, thresholds)
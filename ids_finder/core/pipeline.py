@@ -1,71 +1,690 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../notebooks/00_ids_finder.ipynb.
 
 # %% auto 0
-__all__ = ['compress_data_by_cands', 'ids_finder', 'extract_features']
+__all__ = ['compress_data_by_cands', 'load_candidate_windows', 'StageMetrics', 'ids_finder', 'ids_finder_chunked',
+           'sink_candidates', 'ids_finder_incremental', 'map_partitions', 'parquet_time_range', 'partition_time_ranges',
+           'schedule_work_units', 'extract_features']
 
 # %% ../../notebooks/00_ids_finder.ipynb 3
 #| code-summary: "Import all the packages needed for the project"
 import polars as pl
-from .propeties import process_events
-from .detection import detect_events
-from ..utils.basic import df2ts
+from .propeties import process_events, cluster_candidates, FeatureCache, CandidateWindowIndex
+from ids_finder.core.detection import (
+    DetectionThresholds,
+    THRESHOLDS,
+    detect_events,
+    detect_events_from_blocks,
+    detect_events_lazy,
+    compute_block_stats,
+    block_length,
+)
+from ..utils.basic import df2arrays, format_timedelta
 import numpy as np
 
-from datetime import timedelta
+import os
+import math
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from datetime import datetime, timedelta
 
 from typing import Callable
 
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+from loguru import logger
+
 # %% ../../notebooks/00_ids_finder.ipynb 7
 def compress_data_by_cands(
-    data: pl.DataFrame, candidates: pl.DataFrame
+    data: pl.DataFrame,
+    candidates: pl.DataFrame,
+    return_index: bool = False,  # whether to also return the windows of the candidates in the compressed data
+) -> pl.DataFrame | tuple[pl.DataFrame, CandidateWindowIndex]:
+    """
+    Compress the data for parallel processing
+
+    The windows of the candidates (the samples in `[tstart, tstop]`, as `CandidateWindowIndex.from_times`) overlap a lot,
+    so they are merged with a sweep over the sorted windows, and the compressed data is made of one slice of `data` per merged window.
+    """
+    if candidates.is_empty():
+        data_c = data.clear()
+        return (data_c, CandidateWindowIndex(np.empty(0, np.int64), np.empty(0, np.int64))) if return_index else data_c
+
+    time = data["time"]
+    starts = time.search_sorted(candidates["tstart"], side="left").to_numpy().astype(np.int64)
+    stops = time.search_sorted(candidates["tstop"], side="right").to_numpy().astype(np.int64)
+    stops = np.maximum(stops, starts)
+
+    order = np.argsort(starts, kind="stable")
+    sorted_starts, sorted_stops = starts[order], stops[order]
+    reach = np.maximum.accumulate(sorted_stops)  # end of the merged window so far
+    new_window = np.concatenate([[True], sorted_starts[1:] > reach[:-1]])
+    merged_starts = sorted_starts[new_window]
+    merged_stops = reach[np.concatenate([np.flatnonzero(new_window)[1:] - 1, [len(reach) - 1]])]
+
+    if len(merged_starts) == 1:
+        data_c = data.slice(merged_starts[0], merged_stops[0] - merged_starts[0])  # zero-copy
+    else:
+        data_c = pl.concat(
+            [data.slice(start, stop - start) for start, stop in zip(merged_starts, merged_stops)]
+        )
+
+    if not return_index:
+        return data_c
+
+    # offset of each merged window in the compressed data
+    merged_offsets = np.concatenate([[0], np.cumsum(merged_stops - merged_starts)[:-1]])
+    window = np.empty(len(starts), dtype=np.int64)
+    window[order] = np.cumsum(new_window) - 1
+    shift = merged_offsets[window] - merged_starts[window]
+    return data_c, CandidateWindowIndex(starts + shift, stops + shift)
+
+# %% ../../notebooks/00_ids_finder.ipynb 9
+def load_candidate_windows(
+    ldata: pl.LazyFrame,  # scan of the data
+    candidates: pl.DataFrame,
+    bcols,
+    return_index: bool = False,  # see `compress_data_by_cands`
+) -> pl.DataFrame | tuple[pl.DataFrame, CandidateWindowIndex]:
+    """
+    Load only the samples of `ldata` in the candidate windows `[tstart, tstop]`.
+
+    The filter is pushed down to the scan: the samples are first selected by time buckets (as long as the longest window)
+    containing the windows, so that the predicate stays small, then exactly by `compress_data_by_cands`.
+    The duplicated timestamps (like in overlapping files of the intermediate data) are dropped.
+    """
+    ldata = ldata.select("time", *bcols)
+    if candidates.is_empty():
+        return compress_data_by_cands(ldata.head(0).collect(), candidates, return_index)
+
+    width = (candidates["tstop"] - candidates["tstart"]).max() // timedelta(microseconds=1)
+    width = max(width, 1)
+    buckets = np.unique(
+        np.concatenate(
+            [
+                candidates["tstart"].dt.epoch("us").to_numpy() // width,
+                candidates["tstop"].dt.epoch("us").to_numpy() // width,
+            ]
+        )
+    )  # each window is in at most two buckets
+
+    data = (
+        ldata.filter(
+            pl.col("time").is_between(candidates["tstart"].min(), candidates["tstop"].max())
+            & (pl.col("time").dt.epoch("us") // width).is_in(pl.Series(buckets))
+        )
+        .collect(streaming=True)
+        .sort("time")
+        .unique("time", keep="first", maintain_order=True)
+    )
+    return compress_data_by_cands(data, candidates, return_index)
+
+
+class StageMetrics:
+    """
+    Durations (in seconds) and sizes of the stages of `ids_finder` for one partition.
+
+    When disabled, `stage` and `record` do nothing, so that `ids_finder` is not slowed down.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.values: dict[str, float | int] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        "Time the stage `name`, saved as `{name}_time`"
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.values[f"{name}_time"] = time.perf_counter() - start
+
+    def record(self, **values):
+        if self.enabled:
+            self.values.update(values)
+
+    def log(self):
+        values = self.values
+        durations = ", ".join(f"{name.removesuffix('_time')} {value:.2f} s" for name, value in values.items() if name.endswith("_time"))
+        logger.info(
+            f"{values['rows']} rows compressed to {values['rows_compressed']} ({values['compression_ratio']:.1%}), "
+            f"{values['candidates']} candidates clustered to {values['candidates_clustered']}, {values['ids']} IDs ({durations})"
+        )
+
+
+def ids_finder(
+    ldata: pl.LazyFrame,
+    tau: timedelta | list[timedelta],
+    ts: timedelta,
+    bcols,
+    ldata_fine: pl.LazyFrame | None = None,  # data at a higher resolution (like the native cadence) for the properties
+    cache: FeatureCache | None = None,  # cache of the properties, see `process_events`
+    return_metrics: bool = False,  # whether to also return the metrics of the stages, see `StageMetrics`
+) -> pl.DataFrame | tuple[pl.DataFrame, dict]:
+    """
+    Find the IDs in `ldata`.
+
+    With `ldata_fine`, the candidates are still detected in `ldata` (like resampled data),
+    but their properties are computed with the samples of `ldata_fine` in their windows (see `load_candidate_windows`).
+
+    With `return_metrics`, the durations of the stages, the number of rows before and after compression
+    and the number of candidates before and after clustering are also returned and logged.
+    """
+    metrics = StageMetrics(enabled=return_metrics)
+
+    with metrics.stage("collect"):
+        data = ldata.select("time", *bcols).sort("time").collect()
+
+    with metrics.stage("detect"):
+        events = detect_events(data, tau, ts, bcols)
+
+    with metrics.stage("compress"):
+        if ldata_fine is None:
+            data_c, windows = compress_data_by_cands(data, events, return_index=True)
+        else:
+            data_c, windows = load_candidate_windows(ldata_fine, events, bcols, return_index=True)
+    with metrics.stage("arrays"):
+        sat_fgm = df2arrays(data_c, bcols)
+    with metrics.stage("cluster"):
+        clustered, windows = cluster_candidates(events, sat_fgm, windows, return_index=True)
+    with metrics.stage("properties"):
+        ids = process_events(clustered, sat_fgm, ts, cache=cache, windows=windows)
+
+    if not return_metrics:
+        return ids
+    metrics.record(
+        rows=len(data),
+        rows_compressed=len(data_c),
+        compression_ratio=len(data_c) / len(data) if len(data) else float("nan"),
+        candidates=len(events),
+        candidates_clustered=len(clustered),
+        ids=ids.filter(pl.col("status") == "ok").height,
+    )
+    metrics.log()
+    return ids, metrics.values
+
+# %% ../../notebooks/00_ids_finder.ipynb 11
+def _halo(tau: timedelta | list[timedelta]) -> timedelta:
+    """
+    Margin covering the previous and next windows of every window, see `ids_finder_chunked`.
+
+    The window starting at `t` needs the data from `t - tau` (previous window) to `t + 2 * tau` (end of the next window).
+    """
+    return 2 * max(tau if isinstance(tau, list) else [tau])
+
+
+def _ids_finder_window(
+    unit: tuple[pl.LazyFrame, datetime, datetime],  # data, and the time range of the windows to process
+    tau: timedelta | list[timedelta],
+    ts: timedelta,
+    bcols,
+    cache: FeatureCache | None = None,
+) -> pl.DataFrame | None:
+    """
+    Find the IDs whose window starts in `[start, end)`, from the data in the time range with a halo on both sides.
+
+    Returns `None` if there is no data in the time range, and an empty frame (like `ids_finder`) if there is no candidate.
+    """
+    ldata, start, end = unit
+    halo = _halo(tau)
+    data = (
+        ldata.filter(pl.col("time").is_between(start - halo, end + halo, closed="left"))
+        .sort("time")
+        .collect()
+    )
+    if data.is_empty():
+        return None
+
+    events = detect_events(data, tau, ts, bcols).filter(
+        pl.col("tstart").is_between(start, end, closed="left")
+    )
+    data_c, windows = compress_data_by_cands(data, events, return_index=True)
+    sat_fgm = df2arrays(data_c, bcols)
+    events, windows = cluster_candidates(events, sat_fgm, windows, return_index=True)
+    return process_events(events, sat_fgm, ts, cache=cache, windows=windows)
+
+
+def ids_finder_chunked(
+    ldata: pl.LazyFrame,
+    tau: timedelta | list[timedelta],
+    ts: timedelta,
+    bcols,
+    chunk_size: timedelta = timedelta(days=7),
+    cache: FeatureCache | None = None,
 ):
-    """Compress the data for parallel processing"""
-    ttstarts = candidates["tstart"]
-    ttstops = candidates["tstop"]
-
-    ttstarts_index = data["time"].search_sorted(ttstarts)
-    ttstops_index = data["time"].search_sorted(ttstops)
-
-    indices = np.concatenate(
-        [
-            np.arange(ttstart_index, ttstop_index + 1)
-            for ttstart_index, ttstop_index in zip(ttstarts_index, ttstops_index)
-        ]
-    )  # faster than `pl.arange`
-    indices_unique = (
-        pl.Series(indices).unique().sort()
-    )  # faster than `np.unique(index)`
-    return data[indices_unique]
-
-
-# %% ../../notebooks/00_ids_finder.ipynb 8
-def ids_finder(ldata: pl.LazyFrame, tau: timedelta, ts: timedelta, bcols):
-    
-    data = ldata.sort("time").collect()
-    
-    events = detect_events(data, tau, ts, bcols)
-
-    data_c = compress_data_by_cands(data, events)
-    sat_fgm = df2ts(data_c, bcols)
-    ids = process_events(events, sat_fgm, ts)
-    return ids
+    """
+    Find the IDs by walking through time-sorted chunks of the data.
+
+    Each chunk is loaded with a halo of `2 * tau` on both sides, which covers the previous and next windows
+    of every window starting in the chunk. Only the events whose window starts in the chunk are kept,
+    so the results do not depend on the chunking (nor on how `ldata` is partitioned),
+    and the peak memory is bounded by `chunk_size` instead of the size of `ldata`.
+    """
+    time_range = ldata.select(
+        start=pl.col("time").min(), end=pl.col("time").max()
+    ).collect(streaming=True)
+    start, end = time_range.row(0)
+
+    # the first chunk has data, so there is at least one frame of IDs (maybe empty)
+    ids = [
+        _ids_finder_window((ldata, chunk_start, chunk_start + chunk_size), tau, ts, bcols, cache=cache)
+        for chunk_start in pl.datetime_range(start, end, chunk_size, eager=True)
+    ]
+    return pl.concat([chunk_ids for chunk_ids in ids if chunk_ids is not None])
+
+# %% ../../notebooks/00_ids_finder.ipynb 14
+def sink_candidates(
+    ldata: pl.LazyFrame,  # scan of the data, like the `LazyPolarsDataset` of a partition
+    path: str | Path,
+    tau: timedelta | list[timedelta],
+    ts: timedelta,
+    bcols,
+    thresholds: DetectionThresholds = THRESHOLDS,
+):
+    """
+    Detect the candidates in constant memory and write them to `path`.
+
+    Only the scan of the data is streamed (see `detect_events_lazy`): the candidates are far fewer than the samples
+    and are detected in memory from the block statistics, so they are written directly.
+    """
+    candidates = detect_events_lazy(ldata, tau, ts, bcols, thresholds)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    candidates.write_parquet(path)
+    return candidates.height
+
+# %% ../../notebooks/00_ids_finder.ipynb 17
+def ids_finder_incremental(
+    ldata: pl.LazyFrame,
+    tau: timedelta | list[timedelta],
+    ts: timedelta,
+    bcols,
+    blocks: pl.DataFrame | None = None,  # block statistics of the previous run
+    ids: pl.DataFrame | None = None,  # IDs of the previous run
+    cache: FeatureCache | None = None,
+) -> tuple[pl.DataFrame, pl.DataFrame]:
+    """
+    Find the IDs of the new data in `ldata`, reusing the block statistics of the previous run.
+
+    Only the samples from the last block of `blocks` on are read to update the block statistics,
+    plus a halo of `2 * tau` before it to compute the properties of the updated events.
+    The events whose window starts in the halo (and whose window or neighbors may contain new samples) are replaced,
+    the others are kept. New samples are assumed to be appended after the previous run.
+
+    Without `blocks`, all the data is processed (with the block statistics, see `detect_events_from_blocks`).
+
+    Returns the updated IDs and block statistics.
+    """
+    every = block_length(tau)
+    tau_max = max(tau) if isinstance(tau, list) else tau
+
+    if blocks is None:
+        data = ldata.sort("time").collect()
+        blocks = compute_block_stats(data, every, bcols)
+        events = detect_events_from_blocks(blocks, tau, ts, bcols, every)
+    else:
+        last_block = blocks.row(-1, named=True)
+        start = last_block["time"] - 2 * tau_max
+        data = ldata.filter(pl.col("time") >= start).sort("time").collect()
+
+        new_data = data.filter(pl.col("time") >= last_block["time"])
+        if len(new_data) == last_block["count"]:
+            return ids, blocks  # no new samples
+
+        blocks = pl.concat(
+            [
+                blocks.filter(pl.col("time") < last_block["time"]),
+                compute_block_stats(new_data, every, bcols),
+            ]
+        )
+        events = detect_events_from_blocks(
+            blocks.filter(pl.col("time") >= start - tau_max), tau, ts, bcols, every
+        ).filter(pl.col("tstart") >= start)
+        if ids is not None:
+            ids = ids.filter(pl.col("tstart") < start)
+
+    # without candidates, `new_ids` is empty (like the IDs of `ids_finder`), so that there are always IDs to save
+    data_c, windows = compress_data_by_cands(data, events, return_index=True)
+    sat_fgm = df2arrays(data_c, bcols)
+    events, windows = cluster_candidates(events, sat_fgm, windows, return_index=True)
+    new_ids = process_events(events, sat_fgm, ts, cache=cache, windows=windows)
+    ids = new_ids if ids is None else pl.concat([ids, new_ids])
+    return ids, blocks
+
+# %% ../../notebooks/00_ids_finder.ipynb 19
+_THREAD_ENV_VARS = [
+    "POLARS_MAX_THREADS",
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+]
+
+
+@contextmanager
+def _worker_env(threads: int):
+    "Environment inherited by the worker processes: limited thread pools and no nested modin parallelism"
+    env = {name: str(threads) for name in _THREAD_ENV_VARS} | {"MODIN_ENGINE": "python"}
+    old_env = {name: os.environ.get(name) for name in env}
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        for name, value in old_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def map_partitions(
+    func: Callable,
+    partitions: list,  # first argument of `func` for each partition
+    n_workers: int | None = None,  # number of worker processes, run serially if None or 1
+    threads_per_worker: int | None = None,  # Polars/BLAS threads of each worker (default: cpu_count // n_workers)
+    **kwargs,  # other arguments of `func`
+) -> list:
+    """
+    Apply `func` to every partition, in a process pool if `n_workers > 1`.
+
+    The results are in the order of `partitions`, so that the output does not depend on the number of workers.
+    Workers are spawned (not forked, which is unsafe with the Polars thread pool), and the thread pools of
+    each worker are limited so that the workers do not oversubscribe the cores.
+    """
+    if n_workers is None or n_workers <= 1:
+        return [func(partition, **kwargs) for partition in partitions]
+
+    if threads_per_worker is None:
+        threads_per_worker = max(1, os.cpu_count() // n_workers)
+
+    with _worker_env(threads_per_worker), ProcessPoolExecutor(
+        max_workers=n_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        return list(executor.map(partial(func, **kwargs), partitions))
+
+# %% ../../notebooks/00_ids_finder.ipynb 20
+def _ids_finder_checkpoint(
+    partition: tuple[str, pl.LazyFrame],  # partition key and data
+    checkpoint_dir: str,
+    tau: timedelta | list[timedelta],
+    ts: timedelta,
+    bcols,
+    cache: FeatureCache | None = None,
+) -> pl.DataFrame:
+    "`ids_finder_incremental` with the block statistics and IDs of the partition saved in `checkpoint_dir`"
+    key, ldata = partition
+    blocks_path = Path(checkpoint_dir) / f"{key}.blocks.parquet"
+    ids_path = Path(checkpoint_dir) / f"{key}.ids.parquet"
+
+    blocks = pl.read_parquet(blocks_path) if blocks_path.exists() else None
+    ids = pl.read_parquet(ids_path) if ids_path.exists() else None
+
+    new_ids, new_blocks = ids_finder_incremental(ldata, tau, ts, bcols, blocks, ids, cache)
+    if new_blocks is not blocks:
+        blocks_path.parent.mkdir(parents=True, exist_ok=True)
+        new_blocks.write_parquet(blocks_path)
+        new_ids.write_parquet(ids_path)
+    return new_ids
+
+# %% ../../notebooks/00_ids_finder.ipynb 22
+def parquet_time_range(path: str | Path) -> tuple[int, datetime | None, datetime | None]:
+    """
+    Number of rows and first and last `time` of a time-sorted parquet file.
+
+    The times come from the statistics of the first and last row groups, or only their `time` column is read if there are none.
+    """
+    file = pq.ParquetFile(path)
+    metadata = file.metadata
+    row_groups = [i for i in range(metadata.num_row_groups) if metadata.row_group(i).num_rows > 0]
+    if not row_groups:
+        return 0, None, None
+
+    column = metadata.schema.names.index("time")
+    first, last = (metadata.row_group(i).column(column).statistics for i in (row_groups[0], row_groups[-1]))
+    if first is not None and last is not None and first.has_min_max and last.has_min_max:
+        return metadata.num_rows, first.min, last.max
+    first = file.read_row_group(row_groups[0], columns=["time"])["time"]
+    last = file.read_row_group(row_groups[-1], columns=["time"])["time"]
+    return metadata.num_rows, first[0].as_py(), last[-1].as_py()
+
+
+def _partition_path(partition_load: Callable) -> Path | None:
+    """
+    Local file of a partition of a `PartitionedDataset` (whose values are the `load` methods of the datasets),
+    from the description of its dataset (like `LazyPolarsDataset`, see `AbstractDataset._describe`).
+
+    `None` if the partition is not a local and unversioned file (or not a dataset), which is then scanned (see `partition_time_ranges`).
+    """
+    describe = getattr(getattr(partition_load, "__self__", None), "_describe", None)
+    if describe is None:
+        return None
+    description = describe()
+    if description.get("protocol") != "file" or description.get("version") is not None or "filepath" not in description:
+        return None
+    return Path(description["filepath"])
+
+
+def partition_time_ranges(
+    partitioned_input: dict[str, Callable[..., pl.LazyFrame]],
+) -> pl.DataFrame:
+    """
+    Number of rows and time range of each partition, from the metadata of its parquet file (see `parquet_time_range`).
+
+    The partitions that are not local parquet files (or without `pyarrow`) are scanned for their `time` column.
+    """
+    time_ranges = []
+    for key, partition_load in partitioned_input.items():
+        path = _partition_path(partition_load)
+        if path is not None and path.suffix == ".parquet" and pq is not None:
+            time_range = parquet_time_range(path)
+        else:
+            time_range = (
+                partition_load()
+                .select(rows=pl.count(), start=pl.col("time").min(), end=pl.col("time").max())
+                .collect(streaming=True)
+                .row(0)
+            )
+        time_ranges.append((key, *time_range))
+    return pl.DataFrame(
+        time_ranges,
+        schema={"partition": pl.Utf8, "rows": pl.Int64, "start": pl.Datetime("us"), "end": pl.Datetime("us")},
+        orient="row",
+    )
+
+
+def schedule_work_units(
+    time_ranges: pl.DataFrame,  # rows and time range of the partitions, see `partition_time_ranges`
+    rows_per_unit: int,
+    every: timedelta | None = None,  # grid of the windows, like `block_length(tau)`
+) -> list[tuple[datetime, datetime]]:
+    """
+    Split the time covered by the partitions into time ranges of about `rows_per_unit` rows.
+
+    The rows of each partition are assumed to be evenly spread over its time range.
+    The bounds of the time ranges are snapped to the grid of `every`, so that no window straddles two ranges.
+    """
+    time_ranges = time_ranges.filter(pl.col("rows") > 0).sort("start")
+    if time_ranges.is_empty():
+        return []
+
+    rows = time_ranges["rows"].to_numpy().astype(np.float64)
+    start = time_ranges["start"].dt.epoch("us").to_numpy()
+    end = time_ranges["end"].dt.epoch("us").to_numpy()
+    cum_rows = np.cumsum(rows)
+
+    # time at which the cumulative number of rows reaches each multiple of the rows of a unit
+    n_units = math.ceil(cum_rows[-1] / rows_per_unit)
+    targets = cum_rows[-1] * np.arange(1, n_units) / n_units
+    i = np.searchsorted(cum_rows, targets, side="right")
+    cuts = start[i] + (targets - cum_rows[i] + rows[i]) / rows[i] * (end[i] - start[i])
+    first, cuts = start[0], cuts.astype(np.int64)
+    if every is not None:
+        every_us = every // timedelta(microseconds=1)
+        first, cuts = first // every_us * every_us, cuts // every_us * every_us
+
+    bounds = np.unique(np.concatenate([[first], cuts, [end.max() + 1]]))
+    bounds = pl.Series(bounds).cast(pl.Datetime("us")).to_list()
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _work_units(
+    partitioned_input: dict[str, Callable[..., pl.LazyFrame]],
+    rows_per_unit: int,
+    tau: timedelta | list[timedelta],
+) -> list[tuple[pl.LazyFrame, datetime, datetime]]:
+    "Time ranges of about `rows_per_unit` rows, with the scans of the partitions they (and their halo) overlap"
+    time_ranges = partition_time_ranges(partitioned_input).filter(pl.col("rows") > 0)
+    halo = _halo(tau)
+    units = []
+    for start, end in schedule_work_units(time_ranges, rows_per_unit, block_length(tau)):
+        keys = time_ranges.filter(
+            (pl.col("start") < end + halo) & (pl.col("end") >= start - halo)
+        )["partition"]
+        units.append((pl.concat([partitioned_input[key]() for key in keys]), start, end))
+    return units
+
+# %% ../../notebooks/00_ids_finder.ipynb 23
+def _unique_ids(ids: pl.DataFrame, subset: list[str]) -> pl.DataFrame:
+    """
+    Drop the IDs found more than once (like in overlapping partitions or chunks).
+
+    The failed candidates (see `process_events`) have no `d_time`, so they are deduplicated by their window instead.
+    """
+    if "status" not in ids.columns:
+        return ids.unique(subset, maintain_order=True)
+
+    window_subset = ["tstart", "tstop"] + [col for col in subset if col == "tau"]
+    ids = ids.with_row_count("row")
+    ok = pl.col("status") == "ok"
+    return (
+        pl.concat(
+            [
+                ids.filter(ok).unique(subset, maintain_order=True),
+                ids.filter(~ok).unique(window_subset, maintain_order=True),
+            ]
+        )
+        .sort("row")
+        .drop("row")
+    )
 
 
 def extract_features(
     partitioned_input: dict[str, Callable[..., pl.LazyFrame]],
-    tau: float, # in seconds, yaml input
+    tau: float | list[float], # in seconds, yaml input
     ts: float,  # in seconds, yaml input
     bcols: list[str] = ["B_x", "B_y", "B_z"],
-) -> pl.DataFrame:
-    "wrapper function for partitioned input"
+    chunk_size: float | str | None = None,  # in seconds or like "7d", yaml input
+    n_workers: int | None = None,  # number of processes to run the partitions in parallel
+    checkpoint_dir: str | None = None,  # directory of the checkpoints for incremental runs
+    fine_input: dict[str, Callable[..., pl.LazyFrame]] | pl.LazyFrame | None = None,  # data at the native cadence
+    feature_cache: FeatureCache | None = None,  # cache of the properties of the candidates
+    return_metrics: bool = False,  # whether to also return the metrics of the stages of each partition
+    rows_per_unit: int | None = None,  # process the data in work units of about this number of rows
+) -> pl.DataFrame | tuple[pl.DataFrame, pl.DataFrame]:
+    """
+    wrapper function for partitioned input
 
-    _tau = timedelta(seconds=tau)
+    If `chunk_size` is given, the partitions are treated as one dataset and processed in time-sorted chunks
+    (see `ids_finder_chunked`), so that events across partition boundaries are not lost.
+    Otherwise the partitions are independent and can be processed by `n_workers` processes (see `map_partitions`).
+
+    If `rows_per_unit` is given, the partitions are split or merged into time ranges of about `rows_per_unit` rows
+    (see `schedule_work_units`), processed like the chunks of `ids_finder_chunked` by `n_workers` processes.
+
+    If `checkpoint_dir` is given, the block statistics and IDs of each partition are saved there,
+    and a rerun only processes the new data of each partition (see `ids_finder_incremental`).
+
+    If `fine_input` is given (like the intermediate data before resampling), the candidates are detected in `partitioned_input`
+    but their properties are computed with the samples of `fine_input` in their windows (see `ids_finder`).
+
+    If `feature_cache` is given, only the properties of the new or modified candidates are computed (see `FeatureCache`).
+
+    If `return_metrics`, a DataFrame of the metrics of the stages of each partition (see `StageMetrics`) is also returned.
+    """
+
+    unique_subset = ["d_time", "d_tstart", "d_tstop"]
+    if isinstance(tau, list):
+        # multiple `tau` values are detected together, see `detect_events`
+        _tau = [timedelta(seconds=t) for t in tau]
+        unique_subset.append("tau")
+    else:
+        _tau = timedelta(seconds=tau)
     _ts = timedelta(seconds=ts)
 
-    ids = pl.concat(
-        [
-            ids_finder(partition_load(), _tau, _ts, bcols)
-            for partition_load in partitioned_input.values()
-        ]
+    if chunk_size is not None and checkpoint_dir is not None:
+        raise ValueError("`chunk_size` and `checkpoint_dir` can not be used together")
+    if fine_input is not None and (chunk_size is not None or checkpoint_dir is not None):
+        raise ValueError("`fine_input` can not be used with `chunk_size` or `checkpoint_dir`")
+    if return_metrics and (chunk_size is not None or checkpoint_dir is not None):
+        raise ValueError("`return_metrics` can not be used with `chunk_size` or `checkpoint_dir`")
+    if rows_per_unit is not None and (
+        chunk_size is not None or checkpoint_dir is not None or fine_input is not None or return_metrics
+    ):
+        raise ValueError(
+            "`rows_per_unit` can not be used with `chunk_size`, `checkpoint_dir`, `fine_input` or `return_metrics`"
+        )
+
+    if rows_per_unit is not None:
+        ids = map_partitions(
+            _ids_finder_window,
+            _work_units(partitioned_input, rows_per_unit, _tau),
+            n_workers=n_workers,
+            tau=_tau,
+            ts=_ts,
+            bcols=bcols,
+            cache=feature_cache,
+        )
+        ids = [unit_ids for unit_ids in ids if unit_ids is not None]
+        return _unique_ids(pl.concat(ids), unique_subset)
+
+    if chunk_size is not None:
+        _chunk_size = timedelta(seconds=format_timedelta(chunk_size).total_seconds())
+        ldata = pl.concat(
+            [partition_load() for partition_load in partitioned_input.values()]
+        )
+        ids = ids_finder_chunked(ldata, _tau, _ts, bcols, _chunk_size, cache=feature_cache)
+        return _unique_ids(ids, unique_subset)
+
+    if checkpoint_dir is not None:
+        ids = map_partitions(
+            _ids_finder_checkpoint,
+            [(key, partition_load()) for key, partition_load in partitioned_input.items()],
+            n_workers=n_workers,
+            checkpoint_dir=checkpoint_dir,
+            tau=_tau,
+            ts=_ts,
+            bcols=bcols,
+            cache=feature_cache,
+        )
+        ids = [partition_ids for partition_ids in ids if partition_ids is not None]
+        return _unique_ids(pl.concat(ids), unique_subset)
+
+    if isinstance(fine_input, dict):
+        # the partitions may differ from `partitioned_input` (like daily files), the windows are selected by time
+        fine_input = pl.concat([partition_load() for partition_load in fine_input.values()])
+
+    ids = map_partitions(
+        ids_finder,
+        [partition_load() for partition_load in partitioned_input.values()],
+        n_workers=n_workers,
+        tau=_tau,
+        ts=_ts,
+        bcols=bcols,
+        ldata_fine=fine_input,
+        cache=feature_cache,
+        return_metrics=return_metrics,
     )
-    return ids.unique(["d_time", "d_tstart", "d_tstop"])
+    if not return_metrics:
+        return _unique_ids(pl.concat(ids), unique_subset)
+
+    ids, metrics = zip(*ids)
+    metrics = pl.DataFrame([{"partition": key} | values for key, values in zip(partitioned_input, metrics)])
+    return _unique_ids(pl.concat(ids), unique_subset), metrics
@@ -1,17 +1,19 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../notebooks/02_ids_properties.ipynb.
 
 # %% auto 0
-__all__ = ['THRESHOLD_RATIO', 'get_candidate_data', 'get_candidates', 'calc_duration', 'calc_d_duration', 'find_start_end_times',
-           'get_time_from_condition', 'calc_candidate_duration', 'minvar', 'mva_features',
-           'calc_candidate_mva_features', 'get_data_at_times', 'calc_rotation_angle', 'calc_events_rotation_angle',
+__all__ = ['THRESHOLD_RATIO', 'EVENT_STATUS', 'FEATURE_VERSION', 'get_candidate_data', 'get_candidates', 'calc_duration',
+           'calc_d_duration', 'find_start_end_times', 'get_time_from_condition', 'calc_candidate_duration',
+           'calc_duration_batch', 'minvar', 'mva_features', 'calc_candidate_mva_features', 'minvar_batch',
+           'mva_features_batch', 'get_data_at_times', 'calc_rotation_angle', 'calc_events_rotation_angle',
            'calc_normal_direction', 'calc_events_normal_direction', 'calc_events_vec_change', 'IDsPipeline',
-           'process_events']
+           'CandidateWindowIndex', 'window_hashes', 'FeatureCache', 'process_events', 'cluster_candidates']
 
 # %% ../../notebooks/02_ids_properties.ipynb 2
 #| code-summary: "Import all the packages needed for the project"
 from fastcore.utils import *
 from fastcore.test import *
 from ..utils.basic import df2ts
+from ..utils.polars import vector_columns, compose_vector
 import polars as pl
 import xarray as xr
 
@@ -27,7 +29,17 @@ import pandas
 import numpy as np
 from xarray_einstats import linalg
 
+import math
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from datetime import timedelta
+from typing import Literal
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+import uuid
 
 from loguru import logger
 
@@ -86,7 +98,9 @@ def get_candidates(candidates: pd.DataFrame, candidate_type=None, num: int = 4):
 # %% ../../notebooks/02_ids_properties.ipynb 6
 THRESHOLD_RATIO  = 1/4
 
-def calc_duration(vec: xr.DataArray, threshold_ratio=THRESHOLD_RATIO) -> pandas.Series:
+def calc_duration(vec: xr.DataArray, threshold_ratio=None) -> pandas.Series:
+    if threshold_ratio is None:
+        threshold_ratio = THRESHOLD_RATIO  # read at call time, like `_feature_version`
     # NOTE: gradient calculated at the edge is not reliable.
     vec_diff = vec.differentiate("time", datetime_unit="s").isel(time=slice(1,-1))
     vec_diff_mag = linalg.norm(vec_diff, dims='v_dim')
@@ -165,6 +179,110 @@ def calc_candidate_duration(candidate: pd.Series, data) -> pd.Series:
 
 
 # %% ../../notebooks/02_ids_properties.ipynb 9
+def _segment_reduce(ufunc: np.ufunc, values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    "Reduce `values` over the segments `offsets[i]:offsets[i+1]` (NaN for empty segments)"
+    starts, counts = offsets[:-1], np.diff(offsets)
+    if len(values) == 0:
+        return np.full((len(counts), *values.shape[1:]), np.nan)
+    result = ufunc.reduceat(values, np.minimum(starts, len(values) - 1), axis=0).astype(float)
+    result[counts == 0] = np.nan
+    return result
+
+
+def _segment_gradient(time: np.ndarray, values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    Time derivative (per second) of `values` in each segment `offsets[i]:offsets[i+1]`,
+    with second-order central differences as in `np.gradient` (and `xr.DataArray.differentiate`).
+
+    The derivative at the edges of the segments is not reliable and set to NaN.
+    """
+    dt = np.diff(time).astype(float) / 1e9  # in seconds
+    dt1, dt2 = dt[:-1, None], dt[1:, None]
+    a = -dt2 / (dt1 * (dt1 + dt2))
+    b = (dt2 - dt1) / (dt1 * dt2)
+    c = dt1 / (dt2 * (dt1 + dt2))
+
+    gradient = np.full(values.shape, np.nan)
+    gradient[1:-1] = a * values[:-2] + b * values[1:-1] + c * values[2:]
+
+    edges = np.concatenate([offsets[:-1], offsets[1:] - 1])
+    gradient[edges[(edges >= 0) & (edges < len(values))]] = np.nan
+    return gradient
+
+
+def _duration_indices(
+    time: np.ndarray, data: np.ndarray, offsets: np.ndarray, threshold_ratio=None
+) -> dict[str, np.ndarray]:
+    """
+    `d_star` and `threshold` of each window, and the indices of `d_time`, `d_tstart` and `d_tstop` (-1 if not found)
+
+    `threshold_ratio` defaults to `THRESHOLD_RATIO` at call time, so that it is the one of the cache key (see `_feature_version`).
+    """
+    if threshold_ratio is None:
+        threshold_ratio = THRESHOLD_RATIO
+    index = np.arange(len(time))
+    segment = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+    vec_diff_mag = np.linalg.norm(_segment_gradient(time, data, offsets), axis=1)
+
+    d_star = _segment_reduce(np.fmax, vec_diff_mag, offsets)  # ignore NaN
+    d_star_index = _segment_reduce(
+        np.minimum, np.where(vec_diff_mag == d_star[segment], index, len(time)), offsets
+    )
+    found = d_star_index < len(time)
+    d_star_index = np.where(found, d_star_index, 0).astype(int)
+    threshold = d_star * threshold_ratio
+
+    below = vec_diff_mag < threshold[segment]
+    peak = d_star_index[segment]
+    start_index = _segment_reduce(np.maximum, np.where(below & (index <= peak), index, -1), offsets)
+    stop_index = _segment_reduce(np.minimum, np.where(below & (index >= peak), index, len(time)), offsets)
+
+    def valid_index(idx, valid):
+        return np.where(valid, idx, -1).astype(int)
+
+    return {
+        "d_star": d_star,
+        "threshold": threshold,
+        "d_time": valid_index(d_star_index, found),
+        "d_tstart": valid_index(start_index, found & (start_index >= 0)),
+        "d_tstop": valid_index(stop_index, found & (stop_index < len(time))),
+    }
+
+
+def calc_duration_batch(
+    time: np.ndarray,  # timestamps of all the windows, as `datetime64[ns]` or int64 nanoseconds
+    data: np.ndarray,  # samples of all the windows, an (N, 3) array
+    offsets: np.ndarray,  # window `i` is `data[offsets[i]:offsets[i+1]]`
+    threshold_ratio=None,  # defaults to `THRESHOLD_RATIO`
+) -> pl.DataFrame:
+    """
+    Compute the `calc_duration` of all the windows at once.
+
+    The derivative magnitude is computed once for all the samples, `d_star` and `d_time` with a segment argmax,
+    and `d_tstart`/`d_tstop` with the last/first threshold crossing before/after `d_time` in each window.
+    Values that can not be determined (like all-NaN windows) are null.
+    """
+    time = np.asarray(time).astype("datetime64[ns]")
+    durations = _duration_indices(time.view("int64"), data, np.asarray(offsets), threshold_ratio)
+
+    def times_at(idx):
+        times = time[idx]
+        times[idx < 0] = np.datetime64("NaT")
+        return times
+
+    return pl.DataFrame(
+        {
+            "d_star": durations["d_star"],
+            "d_time": times_at(durations["d_time"]),
+            "threshold": durations["threshold"],
+            "d_tstart": times_at(durations["d_tstart"]),
+            "d_tstop": times_at(durations["d_tstop"]),
+        },
+        nan_to_null=True,
+    )
+
+# %% ../../notebooks/02_ids_properties.ipynb 12
 def minvar(data):
     """
     see `pyspedas.cotrans.minvar`
@@ -231,7 +349,7 @@ def minvar(data):
     return vrot, v, w
 
 
-# %% ../../notebooks/02_ids_properties.ipynb 10
+# %% ../../notebooks/02_ids_properties.ipynb 13
 def mva_features(data: np.ndarray):
     """
     Compute MVA features based on the given data array.
@@ -291,7 +409,7 @@ def mva_features(data: np.ndarray):
     
     return results, output_names
 
-# %% ../../notebooks/02_ids_properties.ipynb 11
+# %% ../../notebooks/02_ids_properties.ipynb 14
 def calc_candidate_mva_features(candidate, data: xr.DataArray):
     results, output_names = mva_features(
         data.sel(time=slice(candidate["d_tstart"], candidate["d_tstop"])).to_numpy()
@@ -299,7 +417,105 @@ def calc_candidate_mva_features(candidate, data: xr.DataArray):
 
     return pandas.Series(results, index=output_names)
 
-# %% ../../notebooks/02_ids_properties.ipynb 15
+# %% ../../notebooks/02_ids_properties.ipynb 16
+def minvar_batch(data: np.ndarray, offsets: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Batched version of `minvar` for the windows `data[offsets[i]:offsets[i+1]]`.
+
+    Returns the principal axes `v` as an (n, 3, 3) array and the eigenvalues `w` as an (n, 3) array,
+    with the same ordering and sign conventions as `minvar`.
+    """
+    counts = np.diff(offsets)
+    data0 = np.nan_to_num(data, nan=0.0)
+
+    # `nanmean(nan_to_num(...))` in `minvar` counts the NaN samples as zeros
+    vecavg = _segment_reduce(np.add, data0, offsets) / counts[:, None]
+    products = (data0[:, :, None] * data0[:, None, :]).reshape(-1, 9)
+    mvamat = _segment_reduce(np.add, products, offsets).reshape(-1, 3, 3) / counts[:, None, None]
+    mvamat -= vecavg[:, :, None] * vecavg[:, None, :]
+
+    valid = counts > 0
+    w = np.full((len(counts), 3), np.nan)
+    v = np.full((len(counts), 3, 3), np.nan)
+    w[valid], v[valid] = np.linalg.eigh(mvamat[valid], UPLO="U")
+
+    # Sorting to ensure descending order
+    w = np.abs(w)
+    idx = np.flip(np.argsort(w, axis=1), axis=1)
+    idx[w.sum(axis=1) == 0.0] = [0, 2, 1]  # IDL compatability
+    w = np.take_along_axis(w, idx, axis=1)
+    v = np.take_along_axis(v, idx[:, None, :], axis=2)
+
+    # Rotate intermediate var direction if system is not Right Handed
+    YcrossZdotX = v[:, 0, 0] * (v[:, 1, 1] * v[:, 2, 2] - v[:, 2, 1] * v[:, 1, 2])
+    v[YcrossZdotX < 0, :, 1] *= -1
+
+    # Ensure minvar direction is along +Z (for FAC system)
+    flip = v[:, 2, 2] < 0
+    v[flip, :, 2] *= -1
+    v[flip, :, 1] *= -1
+
+    return v, w
+
+
+def _mva_features_arrays(data: np.ndarray, offsets: np.ndarray) -> tuple[dict[str, np.ndarray], np.ndarray]:
+    "`mva_features` of all the windows (vector features as (n, 3) arrays), and the eigenvalues"
+    offsets = np.asarray(offsets)
+    starts, stops = offsets[:-1], offsets[1:]
+    counts = stops - starts
+
+    v, w = minvar_batch(data, offsets)
+
+    # rotate each sample with the principal axes of its window
+    window = np.repeat(np.arange(len(counts)), counts)
+    vrot = np.einsum("ni,nij->nj", data, v[window])
+    vec_mag = np.linalg.norm(vrot, axis=1)
+
+    vec_mag_mean = _segment_reduce(np.add, vec_mag, offsets) / counts
+    vec_n_mean = _segment_reduce(np.add, vrot[:, 2], offsets) / counts
+    vec_mag_range = _segment_reduce(np.maximum, vec_mag, offsets) - _segment_reduce(
+        np.minimum, vec_mag, offsets
+    )
+
+    valid = counts > 0
+    first, last = np.where(valid, starts, 0), np.where(valid, stops - 1, 0)
+    dvec = np.where(valid[:, None], vrot[first] - vrot[last], np.nan)
+    dvec_mag = np.where(valid, vec_mag[last] - vec_mag[first], np.nan)
+
+    features = {
+        "b_mag": vec_mag_mean,
+        "b_n": vec_n_mean,
+        "db_mag": dvec_mag,
+        "bn_over_b": vec_n_mean / vec_mag_mean,
+        "db_over_b": np.abs(dvec_mag / vec_mag_mean),
+        "db_over_b_max": vec_mag_range / vec_mag_mean,
+        "Vl": v[:, :, 0],
+        "Vn": v[:, :, 2],
+        "dB_lmn": dvec,
+    }
+    return features, w
+
+
+def mva_features_batch(
+    data: np.ndarray,  # samples of all the windows, an (N, 3) array
+    offsets: np.ndarray,  # window `i` is `data[offsets[i]:offsets[i+1]]`
+    vector_array: bool = False,  # whether to return the vector features as `pl.Array(Float64, 3)` columns
+) -> pl.DataFrame:
+    """
+    Compute the `mva_features` of all the windows at once.
+
+    Vector features are decomposed into `_x`, `_y` and `_z` columns (see `vector_columns`).
+    """
+    features, _ = _mva_features_arrays(data, np.asarray(offsets))
+    columns = {}
+    for name, values in features.items():
+        if values.ndim == 2:
+            columns |= vector_columns(name, values, array=vector_array)
+        else:
+            columns[name] = values
+    return pl.DataFrame(columns)
+
+# %% ../../notebooks/02_ids_properties.ipynb 21
 def get_data_at_times(data: xr.DataArray, times) -> np.ndarray:
     """
     Select data at specified times.
@@ -307,7 +523,7 @@ def get_data_at_times(data: xr.DataArray, times) -> np.ndarray:
     # Use xarray's selection capability if data supports it
     return data.sel(time=times, method="nearest").to_numpy()
 
-# %% ../../notebooks/02_ids_properties.ipynb 16
+# %% ../../notebooks/02_ids_properties.ipynb 22
 def calc_rotation_angle(v1, v2):
     """
     Computes the rotation angle between two vectors.
@@ -336,7 +552,7 @@ def calc_rotation_angle(v1, v2):
     return np.degrees(angle)
 
 
-# %% ../../notebooks/02_ids_properties.ipynb 17
+# %% ../../notebooks/02_ids_properties.ipynb 23
 def calc_events_rotation_angle(events, data: xr.DataArray):
     """
     Computes the rotation angle(s) at two different time steps.
@@ -350,7 +566,7 @@ def calc_events_rotation_angle(events, data: xr.DataArray):
     rotation_angles = calc_rotation_angle(vecs_before, vecs_after)
     return rotation_angles
 
-# %% ../../notebooks/02_ids_properties.ipynb 19
+# %% ../../notebooks/02_ids_properties.ipynb 25
 def calc_normal_direction(v1, v2, normalize=True) -> np.ndarray:
     """
     Computes the normal direction of two vectors.
@@ -366,7 +582,7 @@ def calc_normal_direction(v1, v2, normalize=True) -> np.ndarray:
     return c / np.linalg.norm(c, axis=-1, keepdims=True)
 
 
-# %% ../../notebooks/02_ids_properties.ipynb 20
+# %% ../../notebooks/02_ids_properties.ipynb 26
 def calc_events_normal_direction(events, data: xr.DataArray):
     """
     Computes the normal directions(s) at two different time steps.
@@ -382,7 +598,7 @@ def calc_events_normal_direction(events, data: xr.DataArray):
     return normal_directions.tolist()
 
 
-# %% ../../notebooks/02_ids_properties.ipynb 21
+# %% ../../notebooks/02_ids_properties.ipynb 27
 def calc_events_vec_change(events, data: xr.DataArray):
     """
     Utils function to calculate features related to the change of the magnetic field
@@ -395,7 +611,7 @@ def calc_events_vec_change(events, data: xr.DataArray):
     return (vecs_after - vecs_before).tolist()
     
 
-# %% ../../notebooks/02_ids_properties.ipynb 24
+# %% ../../notebooks/02_ids_properties.ipynb 30
 @patch
 def _transform(self: pdp.ApplyToRows, X, verbose):
     new_cols = X.apply(self._func, axis=1)
@@ -430,7 +646,7 @@ def _transform(self: pdp.ApplyToRows, X, verbose):
         " Only Series and DataFrame are allowed."
     )
 
-# %% ../../notebooks/02_ids_properties.ipynb 26
+# %% ../../notebooks/02_ids_properties.ipynb 32
 class IDsPipeline:
     def __init__(self):
         pass
@@ -468,17 +684,16 @@ class IDsPipeline:
             func_desc="calculating normal direction",
         )
 
-# %% ../../notebooks/02_ids_properties.ipynb 27
+# %% ../../notebooks/02_ids_properties.ipynb 33
 from ..utils.polars import convert_to_pd_dataframe, decompose_vector  # noqa: E402
 
-# %% ../../notebooks/02_ids_properties.ipynb 28
-def process_events(
+# %% ../../notebooks/02_ids_properties.ipynb 34
+def _process_events_legacy(
     candidates_pl: pl.DataFrame,  # potential candidates DataFrame
     sat_fgm: xr.DataArray,  # satellite FGM data
-    data_resolution: timedelta,  # time resolution of the data
     modin=True,
 ) -> pl.DataFrame:
-    "Process candidates DataFrame"
+    "Process candidates DataFrame with the `IDsPipeline` stages"
 
     candidates = convert_to_pd_dataframe(candidates_pl, modin=modin)
 
@@ -507,3 +722,533 @@ def process_events(
         .drop(["dB", "dB_lmn", "normal_direction", "Vl", "Vn"])
     )
     # ValueError: Data type fixed_size_list[pyarrow] not supported by interchange protocol
+
+# %% ../../notebooks/02_ids_properties.ipynb 36
+EVENT_STATUS = ["ok", "too_few_points", "all_nan", "no_threshold_crossing", "degenerate_eigenvalues"]
+
+
+def _is_degenerate(eigenvalues: np.ndarray) -> np.ndarray:
+    "Whether the minimum variance direction is undefined (the intermediate and minimum eigenvalues are equal)"
+    return ~np.isfinite(eigenvalues).all(axis=1) | np.isclose(eigenvalues[:, 1], eigenvalues[:, 2], rtol=1e-10, atol=0)
+
+
+def _event_status(
+    counts: np.ndarray,  # number of samples in each window
+    d_star: np.ndarray,
+    found: np.ndarray,  # whether `d_tstart` and `d_tstop` are found
+    degenerate: np.ndarray,
+) -> np.ndarray:
+    "Index in `EVENT_STATUS` of the first failure of each candidate"
+    return np.select(
+        [counts < 3, np.isnan(d_star), ~found, degenerate],  # at least 3 samples to have a central difference
+        [1, 2, 3, 4],
+        default=0,
+    )
+
+
+@dataclass
+class CandidateWindowIndex:
+    "Sample indices of the candidate windows in a sorted time array"
+
+    starts: np.ndarray  # index of the first sample of each window
+    stops: np.ndarray  # index after the last sample of each window
+    durations: dict[str, np.ndarray] | None = None  # see `with_durations`
+
+    @classmethod
+    def from_times(
+        cls,
+        time: np.ndarray,  # sorted timestamps of the data, as int64 nanoseconds
+        tstart: np.ndarray,
+        tstop: np.ndarray,
+    ):
+        "Index of the windows `[tstart, tstop]` (as selected by `get_candidate_data`)"
+        starts = np.searchsorted(time, tstart, side="left")
+        stops = np.searchsorted(time, tstop, side="right")
+        return cls(starts, np.maximum(stops, starts))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, mask):
+        durations = None if self.durations is None else {name: value[mask] for name, value in self.durations.items()}
+        return CandidateWindowIndex(self.starts[mask], self.stops[mask], durations)
+
+    def with_durations(self, time: np.ndarray, data: np.ndarray) -> "CandidateWindowIndex":
+        """
+        The windows with their `durations` (see `_duration_indices`), computed once and kept by the selections of the windows.
+
+        `d_time`, `d_tstart` and `d_tstop` are the indices of the samples in `time` (-1 if not found).
+        """
+        if self.durations is not None:
+            return self
+        indices = self.indices()
+        durations = _duration_indices(time[indices], data[indices], self.offsets)
+        for name in ["d_time", "d_tstart", "d_tstop"]:
+            durations[name] = np.where(durations[name] >= 0, indices[durations[name]], -1)
+        return CandidateWindowIndex(self.starts, self.stops, durations)
+
+    @property
+    def counts(self) -> np.ndarray:
+        return self.stops - self.starts
+
+    @property
+    def offsets(self) -> np.ndarray:
+        "Offsets of the windows in the concatenated samples (see `indices`)"
+        return np.concatenate([[0], np.cumsum(self.counts)])
+
+    @property
+    def first(self) -> np.ndarray:
+        "Index of the first sample of each window"
+        return self.starts
+
+    @property
+    def last(self) -> np.ndarray:
+        "Index of the last sample of each window"
+        return self.stops - 1
+
+    def indices(self) -> np.ndarray:
+        "Indices of the samples of all the windows, concatenated"
+        offsets = self.offsets
+        return np.arange(offsets[-1]) + np.repeat(self.starts - offsets[:-1], self.counts)
+
+    def gather(self, *arrays: np.ndarray) -> list[np.ndarray]:
+        "Samples of all the windows of each array, concatenated (see `offsets`)"
+        indices = self.indices()
+        return [array[indices] for array in arrays]
+
+
+def _event_properties(
+    time: np.ndarray,  # sorted timestamps of the data, as int64 nanoseconds
+    data: np.ndarray,  # (N, 3) array of the data
+    tstart: np.ndarray,  # start of the candidate windows, as int64 nanoseconds
+    tstop: np.ndarray,
+    vector_array: bool = False,  # see `vector_columns`
+    windows: CandidateWindowIndex | None = None,  # windows of the candidates in `time`, if already known
+) -> pl.DataFrame:
+    """
+    Compute the properties of all the candidates at once, see `calc_duration_batch` and `mva_features_batch`.
+
+    The `status` of each candidate is one of `EVENT_STATUS` (see `_event_status`), and the features of the failed candidates are null.
+    """
+    if windows is None:
+        windows = CandidateWindowIndex.from_times(time, tstart, tstop)
+    durations = windows.with_durations(time, data).durations
+
+    def times_at(idx):
+        return np.where(idx >= 0, time[idx], np.iinfo(np.int64).min).view("datetime64[ns]")
+
+    d_tstart, d_tstop = durations["d_tstart"], durations["d_tstop"]
+    found = (d_tstart >= 0) & (d_tstop >= 0)
+    d_windows = CandidateWindowIndex(d_tstart[found], d_tstop[found] + 1)
+
+    mva, eigenvalues = _mva_features_arrays(*d_windows.gather(data), d_windows.offsets)
+    degenerate = np.zeros(len(windows), dtype=bool)
+    degenerate[found] = _is_degenerate(eigenvalues)
+    status = _event_status(windows.counts, durations["d_star"], found, degenerate)
+
+    vecs_before = data[d_windows.first]
+    vecs_after = data[d_windows.last]
+
+    features = {
+        name: mva[name] for name in ["b_mag", "b_n", "bn_over_b", "db_mag", "db_over_b", "db_over_b_max"]
+    }
+    features["rotation_angle"] = calc_rotation_angle(vecs_before, vecs_after)
+    vectors = {
+        "dB": vecs_after - vecs_before,
+        "dB_lmn": mva["dB_lmn"],
+        "k": calc_normal_direction(vecs_before, vecs_after),
+        "Vl": mva["Vl"],
+        "Vn": mva["Vn"],
+    }
+    for name, vec in vectors.items():
+        features |= vector_columns(name, vec)
+    features = pl.DataFrame(features)
+
+    durations = pl.DataFrame(
+        {
+            "d_star": durations["d_star"],
+            "d_time": times_at(durations["d_time"]),
+            "d_tstart": times_at(d_tstart),
+            "d_tstop": times_at(d_tstop),
+            "threshold": durations["threshold"],
+        },
+        nan_to_null=True,
+    )
+    features = (
+        pl.DataFrame({"row": np.arange(len(windows))})
+        .join(
+            features.with_columns(row=np.flatnonzero(found)).filter(~degenerate[found]),
+            on="row",
+            how="left",
+        )
+        .drop("row")
+        .with_columns(status=pl.Series(np.array(EVENT_STATUS)[status]))
+    )
+    if vector_array:
+        for name in vectors:
+            features = compose_vector(features, name)
+    return pl.concat([durations, features], how="horizontal")
+
+# %% ../../notebooks/02_ids_properties.ipynb 37
+_SHARED_ARRAYS: dict[str, np.ndarray] = {}
+
+
+def _share_array(array: np.ndarray) -> tuple[shared_memory.SharedMemory, tuple]:
+    "Copy `array` to a new shared memory block, returns the block and what `_attach_shared_arrays` needs"
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, array.dtype, buffer=shm.buf)[:] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+def _attach_shared_arrays(specs: dict[str, tuple]):
+    "Initialize a worker with views of the shared arrays (no copy)"
+    for key, (name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=name)
+        _SHARED_ARRAYS[key] = np.ndarray(shape, dtype, buffer=shm.buf)
+        _SHARED_ARRAYS[f"_{key}_shm"] = shm  # keep the block open
+
+
+def _shared_event_properties(rows: tuple[int, int], vector_array: bool = False) -> pl.DataFrame:
+    "`_event_properties` of the candidates `rows[0]:rows[1]`, from the shared arrays"
+    start, stop = rows
+    durations = {
+        key.removeprefix("durations_"): value[start:stop]
+        for key, value in _SHARED_ARRAYS.items()
+        if key.startswith("durations_")
+    }
+    return _event_properties(
+        _SHARED_ARRAYS["time"],
+        _SHARED_ARRAYS["data"],
+        _SHARED_ARRAYS["tstart"][start:stop],
+        _SHARED_ARRAYS["tstop"][start:stop],
+        vector_array=vector_array,
+        windows=CandidateWindowIndex(
+            _SHARED_ARRAYS["starts"][start:stop], _SHARED_ARRAYS["stops"][start:stop], durations or None
+        ),
+    )
+
+
+def _event_properties_pool(
+    time: np.ndarray,
+    data: np.ndarray,
+    tstart: np.ndarray,
+    tstop: np.ndarray,
+    n_workers: int,
+    batch_size: int | None = None,  # number of candidates per task, defaults to 4 tasks per worker
+    vector_array: bool = False,
+    windows: CandidateWindowIndex | None = None,  # see `_event_properties`
+) -> pl.DataFrame:
+    """
+    Compute `_event_properties` in a pool of processes.
+
+    The data and the candidate windows are copied once to shared memory, and each task only sends a range of candidates,
+    so the workers read the data without copying it.
+    """
+    if windows is None:
+        windows = CandidateWindowIndex.from_times(time, tstart, tstop)
+    if len(tstart) == 0:
+        return _event_properties(time, data, tstart, tstop, vector_array, windows)
+    if batch_size is None:
+        batch_size = max(math.ceil(len(tstart) / (4 * n_workers)), 1)
+    arrays = {
+        "time": np.ascontiguousarray(time),
+        "data": np.ascontiguousarray(data, dtype=float),
+        "tstart": np.ascontiguousarray(tstart),
+        "tstop": np.ascontiguousarray(tstop),
+        "starts": np.ascontiguousarray(windows.starts),
+        "stops": np.ascontiguousarray(windows.stops),
+    }
+    if windows.durations is not None:
+        # like computed by `cluster_candidates`
+        arrays |= {f"durations_{name}": np.ascontiguousarray(value) for name, value in windows.durations.items()}
+
+    blocks, specs = {}, {}
+    try:
+        for key, array in arrays.items():
+            blocks[key], specs[key] = _share_array(array)
+        with ProcessPoolExecutor(
+            n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_attach_shared_arrays,
+            initargs=(specs,),
+        ) as executor:
+            rows = [(start, min(start + batch_size, len(tstart))) for start in range(0, len(tstart), batch_size)]
+            results = list(executor.map(partial(_shared_event_properties, vector_array=vector_array), rows))
+    finally:
+        for shm in blocks.values():
+            shm.close()
+            shm.unlink()
+    return pl.concat(results)
+
+
+def _process_events_native(
+    candidates: pl.DataFrame,
+    time: np.ndarray,  # sorted timestamps of the data, as `datetime64[ns]` or int64 nanoseconds
+    data: np.ndarray,  # (N, 3) array of the data
+    n_workers: int | None = None,  # number of processes, see `_event_properties_pool`
+    vector_array: bool = False,  # see `vector_columns`
+    cache: "FeatureCache | None" = None,  # cache of the properties
+    windows: CandidateWindowIndex | None = None,  # windows of the candidates in `time`, if already known
+) -> pl.DataFrame:
+    "Compute the properties of all the candidates, and log the number of failed candidates by status"
+    time = np.asarray(time).astype("datetime64[ns]").view("int64")
+
+    def times(col):
+        return candidates[col].cast(pl.Datetime("ns")).to_physical().to_numpy()
+
+    tstart, tstop = times("tstart"), times("tstop")
+    if windows is None:
+        windows = CandidateWindowIndex.from_times(time, tstart, tstop)
+
+    def compute(mask, vector_array=vector_array):
+        if n_workers is None or n_workers <= 1:
+            return _event_properties(time, data, tstart[mask], tstop[mask], vector_array, windows[mask])
+        return _event_properties_pool(
+            time, data, tstart[mask], tstop[mask], n_workers, vector_array=vector_array, windows=windows[mask]
+        )
+
+    if cache is None:
+        properties = compute(slice(None))
+    else:
+        # the cache stores the vectors as components
+        properties = cache.get_or_compute(
+            time, data, tstart, tstop, lambda mask: compute(mask, vector_array=False), windows=windows
+        )
+        if vector_array:
+            for name in ["dB", "dB_lmn", "k", "Vl", "Vn"]:
+                properties = compose_vector(properties, name)
+
+    failures = properties["status"].filter(properties["status"] != "ok").value_counts(sort=True)
+    if len(failures):
+        counts = ", ".join(f"{status}: {count}" for status, count in failures.iter_rows())
+        logger.info(f"{failures['counts'].sum()} of {len(properties)} candidates failed ({counts})")
+    return pl.concat([candidates, properties], how="horizontal")
+
+# %% ../../notebooks/02_ids_properties.ipynb 39
+FEATURE_VERSION = "1"  # bump when the computation of the properties changes
+
+
+def _feature_version() -> str:
+    "Version of the properties, also invalidated by a change of `THRESHOLD_RATIO`"
+    return f"{FEATURE_VERSION}-{THRESHOLD_RATIO}"
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    "Mix the bits of uint64 values (SplitMix64 finalizer)"
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def window_hashes(
+    time: np.ndarray,  # sorted timestamps of the data, as int64 nanoseconds
+    data: np.ndarray,  # (N, 3) array of the data
+    windows: CandidateWindowIndex,
+) -> np.ndarray:
+    "Hash of the samples (timestamps and values) of each window, changed by any modification of the data in the window"
+    indices, offsets, counts = windows.indices(), windows.offsets, windows.counts
+    position = np.arange(len(indices)) - np.repeat(offsets[:-1], counts)
+    hashes = _splitmix64(position.astype(np.uint64))
+    for column in [time[indices], *np.asarray(data, dtype=np.float64)[indices].T]:
+        hashes = _splitmix64(hashes ^ np.ascontiguousarray(column).view(np.uint64))
+
+    result = np.zeros(len(counts), dtype=np.uint64)
+    if len(indices):
+        nonempty = counts > 0
+        result[nonempty] = np.add.reduceat(hashes, offsets[:-1][nonempty])
+    return result
+
+
+class FeatureCache:
+    """
+    Cache of the properties of the candidates, stored as parquet files in `path`.
+
+    The properties of a candidate are reused if its satellite, window (`tstart`, `tstop`), samples (see `window_hashes`)
+    and the version of the properties (see `FEATURE_VERSION`) are the same, and if all the current property columns are cached.
+
+    The properties of a window are computed together (most of them from the same minimum variance analysis),
+    so a new property column can not be computed alone: after adding one, the cached rows (without it) are not used,
+    and all the properties of the candidates are computed again and cached with the new column.
+    """
+
+    key_columns = ["sat", "tstart", "tstop", "window_hash", "version"]
+
+    def __init__(self, path: str | Path, sat: str = ""):
+        self.path = Path(path)
+        self.sat = sat
+        self.hits = 0
+        self.misses = 0
+
+    def keys(
+        self, time, data, tstart: np.ndarray, tstop: np.ndarray, windows: CandidateWindowIndex | None = None
+    ) -> pl.DataFrame:
+        if windows is None:
+            windows = CandidateWindowIndex.from_times(time, tstart, tstop)
+        return pl.DataFrame(
+            {
+                "sat": [self.sat] * len(windows),
+                "tstart": tstart,
+                "tstop": tstop,
+                "window_hash": window_hashes(time, data, windows),
+                "version": [_feature_version()] * len(windows),
+            },
+            schema_overrides={"tstart": pl.Int64, "tstop": pl.Int64},
+        )
+
+    def lookup(self, keys: pl.DataFrame, schema: dict) -> pl.DataFrame:
+        "Cached columns (of `schema`) of the `keys` found in the cache, with their `row` in `keys`"
+        columns = list(schema)
+        empty = pl.DataFrame(schema={"row": pl.UInt32, **schema})
+        files = list(self.path.glob("*.parquet"))
+        if not files:
+            return empty
+        cache = pl.scan_parquet(files)
+        if not set(columns) <= set(cache.columns):
+            # new property columns, which can not be computed alone, see `FeatureCache`
+            logger.info(f"Feature cache: no cached {set(columns) - set(cache.columns)}, computing all the properties")
+            return empty
+        return (
+            keys.lazy()
+            .with_row_count("row")
+            .join(
+                cache.select(*self.key_columns, *columns).unique(self.key_columns, keep="last"),
+                on=self.key_columns,
+            )
+            .select("row", *columns)
+            .collect()
+        )
+
+    def save(self, entries: pl.DataFrame):
+        self.path.mkdir(parents=True, exist_ok=True)
+        entries.write_parquet(self.path / f"{uuid.uuid4().hex}.parquet")
+
+    def get_or_compute(
+        self,
+        time: np.ndarray,
+        data: np.ndarray,
+        tstart: np.ndarray,
+        tstop: np.ndarray,
+        compute: Callable[[np.ndarray], pl.DataFrame],  # properties of the candidates of a mask
+        windows: CandidateWindowIndex | None = None,  # windows of the candidates in `time`, if already known
+    ) -> pl.DataFrame:
+        "Properties of the candidates, only computing the ones not in the cache"
+        keys = self.keys(time, data, tstart, tstop, windows)
+        schema = compute(np.zeros(len(keys), dtype=bool)).schema
+
+        cached = self.lookup(keys, schema)
+        miss = np.ones(len(keys), dtype=bool)
+        miss[cached["row"].to_numpy()] = False
+        computed = compute(miss)
+        if not computed.is_empty():
+            self.save(pl.concat([keys.filter(miss), computed], how="horizontal"))
+
+        self.hits += len(cached)
+        self.misses += len(computed)
+        logger.info(f"Feature cache: {len(cached)} hits, {len(computed)} misses")
+        return (
+            pl.concat(
+                [
+                    cached,
+                    computed.with_columns(row=pl.Series(np.flatnonzero(miss), dtype=pl.UInt32)).select(cached.columns),
+                ]
+            )
+            .sort("row")
+            .drop("row")
+        )
+
+# %% ../../notebooks/02_ids_properties.ipynb 40
+def _fgm_arrays(
+    sat_fgm: xr.DataArray | tuple[np.ndarray, np.ndarray],
+) -> tuple[np.ndarray, np.ndarray]:
+    "Timestamps (as int64 nanoseconds) and contiguous (N, 3) array of the FGM data"
+    if isinstance(sat_fgm, xr.DataArray):
+        sat_fgm = (sat_fgm.time.to_numpy(), sat_fgm.to_numpy())
+    time, data = sat_fgm
+    return np.asarray(time).astype("datetime64[ns]").view("int64"), np.ascontiguousarray(data, dtype=np.float64)
+
+
+def process_events(
+    candidates_pl: pl.DataFrame,  # potential candidates DataFrame
+    sat_fgm: xr.DataArray | tuple[np.ndarray, np.ndarray],  # satellite FGM data, or its timestamps and (N, 3) array (see `df2arrays`)
+    data_resolution: timedelta,  # time resolution of the data
+    modin=True,  # only used by the legacy engine
+    engine: Literal["native", "legacy"] = "native",
+    n_workers: int | None = None,  # number of processes of the native engine
+    vector_array: bool = False,  # whether the native engine returns vectors as `pl.Array(Float64, 3)` columns
+    cache: FeatureCache | None = None,  # cache of the properties for the native engine
+    windows: CandidateWindowIndex | None = None,  # windows of the candidates in the data for the native engine
+) -> pl.DataFrame:
+    """
+    Process candidates DataFrame
+
+    The `native` engine computes the properties of all the candidates at once with Polars and NumPy,
+    the `legacy` engine applies the `IDsPipeline` stages candidate by candidate with `pdpipe` (and `modin`).
+    Both engines return the same columns, except the `status` column of the native engine:
+    the candidates whose properties can not be computed are kept with null features (see `EVENT_STATUS`),
+    while the legacy engine drops them.
+    With `n_workers`, the native engine shares the data with a pool of processes (see `_event_properties_pool`).
+    With `cache`, only the properties of the new or modified candidates are computed (see `FeatureCache`).
+
+    The native engine works on the timestamps (as int64 nanoseconds) and the (N, 3) array of the data,
+    so passing them directly (see `df2arrays`) avoids building a `xr.DataArray`, only needed by the legacy engine.
+    The `windows` of the candidates (like returned by `cluster_candidates`) avoid searching them again in the timestamps.
+    """
+    if engine == "native":
+        return _process_events_native(
+            candidates_pl, *_fgm_arrays(sat_fgm),
+            n_workers=n_workers,
+            vector_array=vector_array,
+            cache=cache,
+            windows=windows,
+        )
+    elif engine == "legacy":
+        if not isinstance(sat_fgm, xr.DataArray):
+            time, data = _fgm_arrays(sat_fgm)
+            sat_fgm = xr.DataArray(data, coords={"time": time.view("datetime64[ns]"), "v_dim": ["x", "y", "z"]})
+        return _process_events_legacy(candidates_pl, sat_fgm, modin=modin)
+    else:
+        raise ValueError(f"Unknown engine: {engine}")
+
+# %% ../../notebooks/02_ids_properties.ipynb 45
+def cluster_candidates(
+    candidates_pl: pl.DataFrame,  # potential candidates DataFrame
+    sat_fgm: xr.DataArray | tuple[np.ndarray, np.ndarray],  # satellite FGM data, see `process_events`
+    windows: CandidateWindowIndex | None = None,  # windows of the candidates in the data (like from `compress_data_by_cands`)
+    return_index: bool = False,  # whether to also return the windows of the representatives (with their durations), for `process_events`
+) -> pl.DataFrame | tuple[pl.DataFrame, CandidateWindowIndex]:
+    """
+    Keep one representative candidate of each cluster of candidates
+
+    Candidates sharing the same peak of the derivative (`d_time`) and the same `d_tstart` and `d_tstop` are in the same cluster
+    (their windows overlap, as they both contain `d_time`), and the first of them is kept.
+    Candidates with a different `tau` (see `detect_events`) are never in the same cluster,
+    and candidates whose times can not be determined are all kept.
+
+    With `return_index`, the windows of the representatives keep the durations computed for the clustering
+    (see `CandidateWindowIndex.with_durations`), so that `process_events` does not compute them again.
+    """
+    time, data = _fgm_arrays(sat_fgm)
+
+    def times(col):
+        return candidates_pl[col].cast(pl.Datetime("ns")).to_physical().to_numpy()
+
+    if windows is None:
+        windows = CandidateWindowIndex.from_times(time, times("tstart"), times("tstop"))
+    windows = windows.with_durations(time, data)
+    keys = pl.DataFrame({name: windows.durations[name] for name in ["d_time", "d_tstart", "d_tstop"]}).with_row_count()
+    if "tau" in candidates_pl.columns:
+        keys = keys.with_columns(candidates_pl["tau"])
+
+    found = (pl.col("d_time") >= 0) & (pl.col("d_tstart") >= 0) & (pl.col("d_tstop") >= 0)
+    representatives = pl.concat(
+        [
+            keys.filter(found).unique(keys.columns[1:], keep="first", maintain_order=True),
+            keys.filter(~found),
+        ]
+    )["row_nr"].sort()
+
+    logger.debug(f"{len(candidates_pl)} candidates clustered into {len(representatives)}")
+    if return_index:
+        return candidates_pl[representatives], windows[representatives.to_numpy()]
+    return candidates_pl[representatives]
@@ -0,0 +1,263 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../notebooks/22_hooks.ipynb.
+
+# %% auto 0
+__all__ = ['RUN_METRICS_SCHEMA', 'data_size', 'storage_size', 'ProfilingHooks']
+
+# %% ../notebooks/22_hooks.ipynb 2
+import os
+import time
+import uuid
+import shutil
+import cProfile
+import resource
+import multiprocessing
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import xarray as xr
+from loguru import logger
+
+from kedro.framework.hooks import hook_impl
+from kedro.io import DataCatalog
+from kedro.io.core import get_filepath_str
+from kedro.pipeline.node import Node
+
+# %% ../notebooks/22_hooks.ipynb 3
+def _reset_peak_rss():
+    "Reset the peak resident set size of the process (Linux only)"
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss() -> int:
+    "Peak resident set size of the process, in bytes"
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _rss() -> int:
+    "Resident set size of the process, in bytes (the peak if unknown)"
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return _peak_rss()
+
+
+def _cpu_time() -> float:
+    "CPU time of the process and of its terminated children (like the processes of `n_workers`), in seconds"
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def data_size(data: Any) -> tuple[int | None, int | None]:
+    "Number of rows and bytes in memory of loaded or saved data, `None` if unknown (like for lazy data)"
+    if isinstance(data, pl.DataFrame):
+        return data.height, data.estimated_size()
+    if isinstance(data, pd.DataFrame):
+        return len(data), int(data.memory_usage(deep=True).sum())
+    if isinstance(data, (xr.DataArray, xr.Dataset)):
+        return (data.sizes[next(iter(data.dims))] if data.dims else 1), data.nbytes
+    if isinstance(data, np.ndarray):
+        return (data.shape[0] if data.ndim else 1), data.nbytes
+    if isinstance(data, dict) and data:
+        # partitions, unknown if any of them is lazy
+        sizes = [data_size(partition) for partition in data.values()]
+        if all(None not in size for size in sizes):
+            return sum(rows for rows, _ in sizes), sum(nbytes for _, nbytes in sizes)
+    return None, None
+
+
+def storage_size(dataset: Any) -> int | None:
+    "Number of bytes of the files of a dataset, `None` if it is not stored in local or cloud files"
+    try:
+        if hasattr(dataset, "_normalized_path"):  # `PartitionedDataset`
+            return dataset._filesystem.du(dataset._normalized_path)
+        if dataset._protocol in ("http", "https"):
+            return None
+        path = dataset._get_load_path() if hasattr(dataset, "_get_load_path") else dataset._filepath
+        return dataset._fs.du(get_filepath_str(path, dataset._protocol))
+    except Exception:  # not a file dataset, or not saved yet
+        return None
+
+# %% ../notebooks/22_hooks.ipynb 4
+RUN_METRICS_SCHEMA = {
+    "kind": pl.Utf8,  # `node`, `load` or `save`
+    "name": pl.Utf8,  # name of the node or dataset
+    "node": pl.Utf8,  # node loading or saving the dataset
+    "status": pl.Utf8,  # `ok` or `error`
+    "wall_time": pl.Float64,  # seconds
+    "cpu_time": pl.Float64,  # seconds
+    "peak_rss_delta": pl.Int64,  # bytes, increase of the peak resident set size over the resident set size at the start
+    "rows": pl.Int64,
+    "memory_bytes": pl.Int64,
+    "storage_bytes": pl.Int64,
+    "pid": pl.Int64,
+}
+
+
+class ProfilingHooks:
+    """
+    Record the wall time, CPU time and peak RSS delta of each node, and the rows and bytes of each dataset load and save.
+
+    Kedro loads the inputs of a node before `before_node_run` and saves its outputs after `after_node_run`,
+    so the time of a node does not include its datasets. Lazy datasets (like `LazyPolarsDataset`) are only read in the node,
+    their `storage_bytes` still gives the size of their files.
+
+    With `ParallelRunner`, the nodes run in other processes with their own hooks, whose records are saved to parts of the run metrics
+    after each node and gathered at the end of the run.
+    """
+
+    def __init__(
+        self,
+        output_dir: str | Path = "data/08_reporting/run_metrics",
+        profile_nodes: list[str] | str | None = None,  # names or patterns of the nodes to profile, default from `IDS_FINDER_PROFILE_NODES`
+    ):
+        self.output_dir = Path(output_dir)
+        if profile_nodes is None:
+            profile_nodes = os.environ.get("IDS_FINDER_PROFILE_NODES", "")
+        if isinstance(profile_nodes, str):
+            profile_nodes = [pattern for pattern in profile_nodes.split(",") if pattern]
+        self.profile_nodes = profile_nodes
+
+        self._catalog: DataCatalog | None = None
+        self._session_id: str | None = None
+        self._started: dict[tuple, tuple[float, float, int]] = {}
+        self._profiles: dict[str, cProfile.Profile] = {}
+        self._records: list[dict] = []
+
+    def _start(self, key: tuple):
+        _reset_peak_rss()
+        self._started[key] = (time.perf_counter(), _cpu_time(), _rss())
+
+    def _stop(self, key: tuple, **record):
+        wall_time, cpu_time, rss = self._started.pop(key)
+        record.update(
+            wall_time=time.perf_counter() - wall_time,
+            cpu_time=_cpu_time() - cpu_time,
+            peak_rss_delta=_peak_rss() - rss,
+            pid=os.getpid(),
+        )
+        self._records.append(record)
+
+    def _dataset_record(self, dataset_name: str, data: Any) -> dict:
+        rows, memory_bytes = data_size(data)
+        try:
+            dataset = self._catalog._get_dataset(dataset_name)
+        except Exception:
+            dataset = None
+        return dict(rows=rows, memory_bytes=memory_bytes, storage_bytes=storage_size(dataset))
+
+    @staticmethod
+    def _tracked(dataset_name: str) -> bool:
+        return not (dataset_name == "parameters" or dataset_name.startswith("params:"))
+
+    @property
+    def _parts_dir(self) -> Path:
+        return self.output_dir / f"{self._session_id}.parts"
+
+    def _flush(self):
+        "Save the records of this process to a part of the run metrics"
+        if not self._records:
+            return
+        self._parts_dir.mkdir(parents=True, exist_ok=True)
+        records = pl.DataFrame(self._records, schema=RUN_METRICS_SCHEMA)
+        records.write_parquet(self._parts_dir / f"{uuid.uuid4().hex}.parquet")
+        self._records = []
+
+    def _end_node(self, node: Node, status: str):
+        self._stop(("node", node.name), kind="node", name=node.name, node=node.name, status=status)
+        profile = self._profiles.pop(node.name, None)
+        if profile is not None:
+            profile.disable()
+            path = self.output_dir / f"{self._session_id}.prof" / f"{node.name}.prof"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(path)
+            logger.info(f"Profile of node {node.name} saved to {path}")
+        if multiprocessing.parent_process() is not None:
+            # worker of `ParallelRunner`, without `after_pipeline_run`
+            self._flush()
+
+    def _save_run_metrics(self, run_params: dict[str, Any]) -> pl.DataFrame:
+        self._session_id = run_params.get("session_id", self._session_id)
+        self._flush()
+        if not self._parts_dir.exists():
+            return pl.DataFrame(schema=RUN_METRICS_SCHEMA)
+        metrics = pl.read_parquet(self._parts_dir / "*.parquet")
+        path = self.output_dir / f"{self._session_id}.parquet"
+        metrics.write_parquet(path)
+        shutil.rmtree(self._parts_dir)
+
+        slowest = metrics.filter(pl.col("kind") == "node").sort("wall_time", descending=True).head(5)
+        summary = ", ".join(f"{name}: {wall_time:.1f} s" for name, wall_time in slowest.select("name", "wall_time").iter_rows())
+        logger.info(f"Run metrics saved to {path} (slowest nodes: {summary})")
+        return metrics
+
+    @hook_impl
+    def after_catalog_created(self, catalog: DataCatalog) -> None:
+        self._catalog = catalog
+
+    @hook_impl
+    def before_pipeline_run(self, run_params: dict[str, Any]) -> None:
+        self._session_id = run_params.get("session_id")
+
+    @hook_impl
+    def before_node_run(self, node: Node, catalog: DataCatalog, session_id: str) -> None:
+        self._catalog = catalog
+        self._session_id = session_id
+        if any(fnmatch(node.name, pattern) for pattern in self.profile_nodes):
+            self._profiles[node.name] = profile = cProfile.Profile()
+            profile.enable()
+        self._start(("node", node.name))
+
+    @hook_impl
+    def after_node_run(self, node: Node) -> None:
+        self._end_node(node, "ok")
+
+    @hook_impl
+    def on_node_error(self, node: Node) -> None:
+        self._end_node(node, "error")
+
+    @hook_impl
+    def before_dataset_loaded(self, dataset_name: str, node: Node) -> None:
+        if self._tracked(dataset_name):
+            self._start(("load", dataset_name, node.name))
+
+    @hook_impl
+    def after_dataset_loaded(self, dataset_name: str, data: Any, node: Node) -> None:
+        if self._tracked(dataset_name):
+            record = self._dataset_record(dataset_name, data)
+            self._stop(("load", dataset_name, node.name), kind="load", name=dataset_name, node=node.name, status="ok", **record)
+
+    @hook_impl
+    def before_dataset_saved(self, dataset_name: str, node: Node) -> None:
+        self._start(("save", dataset_name, node.name))
+
+    @hook_impl
+    def after_dataset_saved(self, dataset_name: str, data: Any, node: Node) -> None:
+        record = self._dataset_record(dataset_name, data)
+        self._stop(("save", dataset_name, node.name), kind="save", name=dataset_name, node=node.name, status="ok", **record)
+
+    @hook_impl
+    def after_pipeline_run(self, run_params: dict[str, Any]) -> None:
+        self._save_run_metrics(run_params)
+
+    @hook_impl
+    def on_pipeline_error(self, run_params: dict[str, Any]) -> None:
+        self._save_run_metrics(run_params)
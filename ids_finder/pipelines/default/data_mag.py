@@ -9,13 +9,40 @@ from kedro.pipeline.modular_pipeline import pipeline
 
 from ... import PARAMS
 from ...core.pipeline import extract_features
+from ...core.propeties import FeatureCache
+from ...utils.basic import format_tau
 from ids_finder.pipelines.default.data import (
     create_pipeline_template as create_pipeline_template_base,
 )
 
+from functools import update_wrapper
 from typing import Callable, Optional
 
 # %% ../../../notebooks/pipelines/2_data_mag.ipynb 3
+def _with_run_options(
+    extract_features_fn: Callable,
+    namespace: str,
+    output: str,  # name of the feature output, for its checkpoint directory
+) -> Callable:
+    """
+    `extract_features_fn` taking the `checkpoint_dir`, `feature_cache` and `refine` parameters of the run
+    (like `kedro run --params detection.checkpoint_dir=...`), which depend on the namespace of the pipeline.
+    """
+
+    def extract_features_node(*args, checkpoint_dir=None, feature_cache=None, refine=False, fine_input=None, **kwargs):
+        if checkpoint_dir is not None:
+            # one checkpoint directory per feature output, see `extract_features`
+            kwargs["checkpoint_dir"] = f"{checkpoint_dir}/{namespace}.{output}"
+        if feature_cache is not None:
+            kwargs["feature_cache"] = FeatureCache(feature_cache, sat=namespace)
+        if refine:
+            # detect in the resampled data, but compute the properties at the native cadence
+            kwargs["fine_input"] = fine_input
+        return extract_features_fn(*args, **kwargs)
+
+    return update_wrapper(extract_features_node, extract_features_fn)
+
+
 def create_extra_pipeline(
     sat_id: str,  # satellite id, used for namespace
     source: str,  # source data, like "mag" or "plasma"
@@ -27,18 +54,30 @@ def create_extra_pipeline(
 
     tau = params["tau"]
     ts = params[sat_id][source]["time_resolution"]
-    tau_str = f"tau_{tau}s"
+    tau_str = format_tau(tau)  # like `tau_60s`, or `tau_30s_60s_120s` for multiple values
     ts_str = f"ts_{ts}s"
+    datatype = params[sat_id][source]["datatype"]
+
+    output = f"feature_{ts_str}_{tau_str}"
+
+    inputs = dict(
+        partitioned_input=f"primary_data_{ts_str}",
+        tau="params:tau",
+        ts="params:time_resolution",
+        bcols="params:bcols",
+        chunk_size="params:detection.chunk_size",
+        rows_per_unit="params:detection.rows_per_unit",
+        n_workers="params:detection.n_workers",
+        checkpoint_dir="params:detection.checkpoint_dir",
+        feature_cache="params:detection.feature_cache",
+        refine="params:detection.refine",
+        fine_input=f"inter_data_{datatype}",  # only used with `refine`
+    )
 
     node_extract_features = node(
-        extract_features_fn,
-        inputs=[
-            f"primary_data_{ts_str}",
-            "params:tau",
-            "params:time_resolution",
-            "params:bcols",
-        ],
-        outputs=f"feature_{ts_str}_{tau_str}",
+        _with_run_options(extract_features_fn, namespace, output),
+        inputs=inputs,
+        outputs=output,
         name="extract_features",
     )
 
@@ -47,7 +86,15 @@ def create_extra_pipeline(
     return pipeline(
         nodes,
         namespace=namespace,
-        parameters={"params:tau": "params:tau"},
+        parameters={
+            "params:tau": "params:tau",
+            "params:detection.chunk_size": "params:detection.chunk_size",
+            "params:detection.rows_per_unit": "params:detection.rows_per_unit",
+            "params:detection.n_workers": "params:detection.n_workers",
+            "params:detection.checkpoint_dir": "params:detection.checkpoint_dir",
+            "params:detection.feature_cache": "params:detection.feature_cache",
+            "params:detection.refine": "params:detection.refine",
+        },
     )
 
 
@@ -12,7 +12,13 @@ import polars.selectors as cs
 from typing import Optional
 
 # %% ../../../notebooks/pipelines/10_mission.ipynb 4
+def _ok_events(df: pl.LazyFrame) -> pl.LazyFrame:
+    "Drop the failed candidates, whose features are null (see `process_events`)"
+    return df.filter(pl.col("status") == "ok") if "status" in df.columns else df
+
+
 def combine_features(candidates: pl.LazyFrame, states_data: pl.LazyFrame):
+    candidates = _ok_events(candidates)
     # change time format: see issue: https://github.com/pola-rs/polars/issues/12023
     states_data = states_data.with_columns(
         cs.datetime().dt.cast_time_unit("ns"),
@@ -102,7 +108,8 @@ def calc_combined_features(df: pl.LazyFrame):
     j_factor = ((u.nT / u.s) * (1 / mu0 / (u.km / u.s))).to(u.nA / u.m**2)
 
     result = (
-        df.with_columns(
+        _ok_events(df)
+        .with_columns(
             duration=pl.col("d_tstop") - pl.col("d_tstart"),
         )
         .pipe(calc_rotation_angle_pl, b_cols, normal_cols, name="theta_n_b")
@@ -133,7 +140,7 @@ def calc_combined_features(df: pl.LazyFrame):
 # %% ../../../notebooks/pipelines/10_mission.ipynb 17
 from kedro.pipeline import Pipeline, node
 from kedro.pipeline.modular_pipeline import pipeline
-from ...utils.basic import load_params
+from ...utils.basic import load_params, format_tau
 
 # %% ../../../notebooks/pipelines/10_mission.ipynb 18
 def create_combined_data_pipeline(
@@ -151,7 +158,7 @@ def create_combined_data_pipeline(
     
     ts_mag_str = f"ts_{ts_mag}s"
     ts_state_str = f"ts_{ts_state}s"
-    tau_str = f"tau_{tau}s"
+    tau_str = format_tau(tau)
 
     node_combine_features = node(
         combine_features,
@@ -2,7 +2,7 @@
 
 # %% auto 0
 __all__ = ['JunoPhases', 'JunoFGMCoords', 'JunoFGMTimeResolutions', 'download_data', 'parse_fp', 'load_data', 'preprocess_data',
-           'process_data', 'create_pipeline', 'process_jno_index', 'create_jno_index_pipeline']
+           'process_data', 'create_pipeline', 'process_jno_index', 'concat_jno_index', 'create_jno_index_pipeline']
 
 # %% ../../../notebooks/missions/juno/mag.ipynb 1
 from datetime import datetime
@@ -152,13 +152,17 @@ def process_jno_index(df: pandas.DataFrame):
 from kedro.pipeline import pipeline, node
 
 # %% ../../../notebooks/missions/juno/mag.ipynb 23
+def concat_jno_index(*indexes: pandas.DataFrame) -> pandas.DataFrame:
+    return pandas.concat(indexes)
+
+
 def create_jno_index_pipeline():
     jno_index_pipeline = pipeline(
         [
             node(process_jno_index, inputs="raw_JNO_SS_index", outputs="JNO_SS_index"),
             node(process_jno_index, inputs="raw_JNO_J_index", outputs="JNO_J_index"),
             node(
-                lambda x1, x2: pandas.concat([x1, x2]),
+                concat_jno_index,
                 inputs=["JNO_SS_index", "JNO_J_index"],
                 outputs="JNO_index",
             ),
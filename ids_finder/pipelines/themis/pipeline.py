@@ -18,7 +18,7 @@ from ..default.mission import create_combined_data_pipeline
 from typing import Optional
 
 # %% ../../../notebooks/missions/themis/index.ipynb 7
-from ...utils.basic import filter_tranges_df
+from ...utils.basic import filter_tranges_df, format_tau
 
 def filter_sw_events(events: pl.LazyFrame, sw_state: pl.LazyFrame) -> pl.LazyFrame:
     
@@ -29,13 +29,13 @@ def filter_sw_events(events: pl.LazyFrame, sw_state: pl.LazyFrame) -> pl.LazyFra
 
 def create_sw_events_pipeline(
     sat_id,
-    tau: int = 60,
+    tau: int | list[int] = 60,
     ts_mag: int = 1,
     
 ):
   
     ts_mag_str = f"ts_{ts_mag}s"
-    tau_str = f"tau_{tau}s"
+    tau_str = format_tau(tau)
     
     node_filter_sw_events = node(
         filter_sw_events,
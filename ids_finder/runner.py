@@ -0,0 +1,99 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../notebooks/23_runner.ipynb.
+
+# %% auto 0
+__all__ = ['MissionParallelRunner']
+
+# %% ../notebooks/23_runner.ipynb 2
+import os
+import multiprocessing
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import chain
+
+from kedro.runner import ParallelRunner
+from kedro.runner.parallel_runner import _bootstrap_subprocess, _run_node_synchronization
+from kedro.pipeline import Pipeline
+from kedro.io import DataCatalog
+from pluggy import PluginManager
+
+from .core.pipeline import _worker_env
+
+# %% ../notebooks/23_runner.ipynb 3
+def _init_worker(package_name: str | None, logging_config: dict | None):
+    "Configure the Kedro project in a spawned worker (as `ParallelRunner` does when spawn is the default start method)"
+    if package_name:
+        _bootstrap_subprocess(package_name, logging_config)
+
+
+class MissionParallelRunner(ParallelRunner):
+    """
+    `ParallelRunner` running the independent pipelines of the missions concurrently.
+
+    The workers are spawned (not forked, which is unsafe with the Polars thread pool) from a local `spawn` context,
+    without changing the start method of the interpreter, and their thread pools are limited
+    so that the workers do not oversubscribe the cores (see `map_partitions`).
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        is_async: bool = False,
+        threads_per_worker: int | None = None,  # Polars/BLAS threads of each worker (default: cpu_count // workers)
+    ):
+        super().__init__(max_workers=max_workers, is_async=is_async)
+        self.threads_per_worker = threads_per_worker
+        self._mp_context = multiprocessing.get_context("spawn")
+
+    def _run(
+        self,
+        pipeline: Pipeline,
+        catalog: DataCatalog,
+        hook_manager: PluginManager,
+        session_id: str | None = None,
+    ) -> None:
+        threads = self.threads_per_worker
+        if threads is None:
+            threads = max(1, (os.cpu_count() or 1) // self._get_required_workers_count(pipeline))
+        with _worker_env(threads):
+            self._run_spawned(pipeline, catalog, session_id)
+
+    def _run_spawned(self, pipeline: Pipeline, catalog: DataCatalog, session_id: str | None = None) -> None:
+        "`ParallelRunner._run`, with the pool of workers of the `spawn` context"
+        from kedro.framework.project import LOGGING, PACKAGE_NAME
+
+        nodes = pipeline.nodes
+        self._validate_catalog(catalog, pipeline)
+        self._validate_nodes(nodes)
+
+        load_counts = Counter(chain.from_iterable(n.inputs for n in nodes))
+        node_dependencies = pipeline.node_dependencies
+        todo_nodes = set(node_dependencies)
+        done_nodes = set()
+        futures = set()
+        with ProcessPoolExecutor(
+            max_workers=self._get_required_workers_count(pipeline),
+            mp_context=self._mp_context,
+            initializer=_init_worker,
+            initargs=(PACKAGE_NAME, LOGGING),
+        ) as pool:
+            while True:
+                ready = {n for n in todo_nodes if node_dependencies[n] <= done_nodes}
+                todo_nodes -= ready
+                for node in ready:
+                    futures.add(pool.submit(_run_node_synchronization, node, catalog, self._is_async, session_id))
+                if not futures:
+                    if todo_nodes:
+                        raise RuntimeError(f"Unable to schedule the nodes {todo_nodes} after {done_nodes}")
+                    break
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = future.result()
+                    done_nodes.add(node)
+                    # release the datasets not needed anymore, like `ParallelRunner`
+                    for dataset in node.inputs:
+                        load_counts[dataset] -= 1
+                        if load_counts[dataset] < 1 and dataset not in pipeline.inputs():
+                            catalog.release(dataset)
+                    for dataset in node.outputs:
+                        if load_counts[dataset] < 1 and dataset not in pipeline.outputs():
+                            catalog.release(dataset)
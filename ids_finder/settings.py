@@ -3,9 +3,18 @@ from the Kedro defaults. For further information, including these default values
 https://kedro.readthedocs.io/en/stable/kedro_project_setup/settings.html."""
 
 # Instantiated project hooks.
-# For example, after creating a hooks.py and defining a ProjectHooks class there, do
-# from ids_finder.hooks import ProjectHooks
-# HOOKS = (ProjectHooks(),)
+import os
+
+from ids_finder.hooks import ProfilingHooks  # noqa: import-outside-toplevel
+
+# The profiling hooks measure every node and dataset (including the size of its files on storage),
+# so they are only registered on request: `IDS_FINDER_PROFILE=1 kedro run`, or with the nodes to profile
+# in `IDS_FINDER_PROFILE_NODES` (see `ProfilingHooks`).
+HOOKS = (
+    (ProfilingHooks(),)
+    if os.environ.get("IDS_FINDER_PROFILE") or os.environ.get("IDS_FINDER_PROFILE_NODES")
+    else ()
+)
 
 # Installed plugins for which to disable hook auto-registration.
 # DISABLE_HOOKS_FOR_PLUGINS = ("kedro-viz",)
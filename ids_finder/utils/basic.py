@@ -2,8 +2,8 @@
 
 # %% auto 0
 __all__ = ['load_catalog', 'load_params', 'DF_TYPE', 'pmap', 'DataConfig', 'filter_tranges', 'filter_tranges_df', 'pl_norm',
-           'partition_data_by_year', 'concat_df', 'concat_partitions', 'format_timedelta', 'resample',
-           'get_memory_usage', 'df2ts', 'calc_vec_mag', 'check_fgm']
+           'partition_data_by_year', 'concat_df', 'concat_partitions', 'format_timedelta', 'format_tau', 'resample',
+           'get_memory_usage', 'df2ts', 'calc_vec_mag', 'df2arrays', 'check_fgm']
 
 # %% ../../notebooks/utils/00_basic.ipynb 1
 from .. import ROOT_DIR
@@ -186,6 +186,11 @@ def format_timedelta(time):
     else:
         raise TypeError(f"Unsupported type: {type(time)}")
 
+
+def format_tau(tau: float | list[float]) -> str:
+    """Format `tau` (in seconds) for dataset names, like `tau_60s` or `tau_30s_60s_120s` for multiple values"""
+    return "tau_" + "_".join(f"{t}s" for t in _expand_selectors(tau))
+
 # %% ../../notebooks/utils/00_basic.ipynb 20
 @overload
 def resample(
@@ -274,6 +279,19 @@ def calc_vec_mag(vec) -> DataArray:
     return linalg.norm(vec, dims="v_dim")
 
 # %% ../../notebooks/utils/00_basic.ipynb 24
+def df2arrays(
+    df: pl.DataFrame, cols: list[str]
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Convert a DataFrame to its timestamps (as int64 nanoseconds) and a contiguous float array of `cols`.
+
+    Unlike `df2ts`, no `xr.DataArray` (and its pandas index) is built, see `process_events`.
+    """
+    time = df["time"].cast(pl.Datetime("ns")).to_physical().to_numpy()
+    data = np.ascontiguousarray(df.select(cols).to_numpy(), dtype=np.float64)
+    return time, data
+
+# %% ../../notebooks/utils/00_basic.ipynb 25
 def check_fgm(vec: xr.DataArray):
     # check if time is monotonic increasing
     logger.info("Check if time is monotonic increasing")
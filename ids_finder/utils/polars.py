@@ -1,17 +1,18 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../notebooks/utils/10_polars.ipynb.
 
 # %% auto 0
-__all__ = ['create_partitions', 'convert_to_pd_dataframe', 'sort', 'pl_norm', 'decompose_vector']
+__all__ = ['create_partitions', 'convert_to_pd_dataframe', 'sort', 'pl_norm', 'decompose_vector', 'vector_columns',
+           'compose_vector']
 
 # %% ../../notebooks/utils/10_polars.ipynb 2
 import polars as pl
+import numpy as np
 import modin.pandas as mpd
 
 from typing import Any, Collection
 
 from functools import partial
 
-
 # %% ../../notebooks/utils/10_polars.ipynb 3
 def create_partitions(files, func):
     keys = [file.split("/")[-1] for file in files]
@@ -91,3 +92,28 @@ def decompose_vector(df: pl.LazyFrame, vector_col, name=None):
         pl.col(vector_col).list.get(2).alias(f"{name}_z"),
     )
 
+
+# %% ../../notebooks/utils/10_polars.ipynb 11
+def vector_columns(
+    name: str,
+    vec: np.ndarray,  # (n, 3) array
+    array: bool = False,  # whether to return one `pl.Array(Float64, 3)` column
+) -> dict[str, pl.Series]:
+    """
+    Columns `{name}_x`, `{name}_y` and `{name}_z` of an (n, 3) array (like `decompose_vector`), or one fixed-width array column.
+
+    No Python object is created per row, so it can be used for many vectors.
+    """
+    vec = np.ascontiguousarray(vec, dtype=np.float64)
+    if array:
+        series = pl.Series(name, vec.ravel()).reshape((-1, 3))
+        return {name: series.cast(pl.Array(inner=pl.Float64, width=3))}
+    return {f"{name}_{component}": vec[:, i] for i, component in enumerate(["x", "y", "z"])}
+
+
+def compose_vector(df: pl.DataFrame | pl.LazyFrame, name: str) -> pl.DataFrame | pl.LazyFrame:
+    "Replace the columns `{name}_x`, `{name}_y` and `{name}_z` by one `pl.Array(Float64, 3)` column (the inverse of `decompose_vector`)"
+    components = [f"{name}_{component}" for component in ["x", "y", "z"]]
+    return df.with_columns(
+        pl.concat_list(components).cast(pl.Array(inner=pl.Float64, width=3)).alias(name)
+    ).drop(components)
@@ -0,0 +1,116 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../../notebooks/utils/40_synthetic.ipynb.
+
+# %% auto 0
+__all__ = ['synthetic_field']
+
+# %% ../../notebooks/utils/40_synthetic.ipynb 2
+import polars as pl
+import numpy as np
+
+from datetime import datetime, timedelta
+
+# %% ../../notebooks/utils/40_synthetic.ipynb 4
+def _random_unit(rng: np.random.Generator, size=None) -> np.ndarray:
+    vec = rng.normal(size=(3,) if size is None else (size, 3))
+    return vec / np.linalg.norm(vec, axis=-1, keepdims=True)
+
+
+def _transition(b: np.ndarray, normal: np.ndarray, angle: float, ratio: float, f: np.ndarray) -> np.ndarray:
+    """
+    Field across a discontinuity, at fractions `f` of the transition.
+
+    The tangential component rotates by `angle` around the normal, and its magnitude changes by `ratio`.
+    """
+    b_n = b @ normal
+    b_t = b - b_n * normal
+    f = f[:, None]
+    rotated = b_t * np.cos(angle * f) + np.cross(normal, b_t) * np.sin(angle * f)
+    return b_n * normal + (1 + (ratio - 1) * f) * rotated
+
+
+def synthetic_field(
+    n: int = 100_000,  # number of samples, before removing the gaps
+    ts: timedelta = timedelta(seconds=1),  # cadence
+    n_events: int = 20,  # number of discontinuities
+    width: timedelta = timedelta(seconds=10),  # duration of the discontinuities
+    td_fraction: float = 0.5,  # fraction of tangential discontinuities, the others are rotational ones
+    noise: float = 0.05,  # standard deviation of the gaussian noise, relative to `b0`
+    gap_fraction: float = 0.0,  # fraction of the samples in data gaps
+    n_gaps: int = 10,  # number of data gaps
+    b0: float = 5.0,  # magnitude of the field
+    start: datetime = datetime(2020, 1, 1),
+    bcols: list[str] = ["BX", "BY", "BZ"],
+    seed: int | None = None,
+) -> tuple[pl.DataFrame, pl.DataFrame]:
+    """
+    Generate a synthetic 3-component magnetic field with discontinuities at known times.
+
+    The field is constant (plus noise) between the discontinuities, which are evenly spread with some jitter.
+    Across a rotational discontinuity (RD), the field rotates around the normal of the discontinuity,
+    keeping its magnitude and normal component. A tangential discontinuity (TD) has no normal component,
+    and its magnitude changes too.
+
+    Returns
+    -------
+    - data: `time` and `bcols`, sorted by time
+    - truth: `time`, `type` and `rotation_angle` (in degrees) of the discontinuities, without the ones in data gaps
+    """
+    rng = np.random.default_rng(seed)
+    width_n = max(1, width // ts)
+    spacing = n // (n_events + 1)
+    if spacing <= 2 * width_n:
+        raise ValueError(f"{n_events} discontinuities of {width} do not fit in {n} samples")
+
+    jitter = (spacing - width_n) // 4
+    centers = np.arange(1, n_events + 1) * spacing + rng.integers(-jitter, jitter + 1, n_events)
+    is_td = rng.random(n_events) < td_fraction
+    angles = rng.uniform(np.pi / 6, np.pi * 5 / 6, n_events)
+
+    vec = np.empty((n, 3))
+    b = b0 * _random_unit(rng)
+    stop = 0
+    for center, td, angle in zip(centers, is_td, angles):
+        if td:
+            # normal perpendicular to the field, and a new magnitude
+            normal = np.cross(b, _random_unit(rng))
+            normal /= np.linalg.norm(normal)
+            ratio = b0 * rng.uniform(0.6, 1.4) / np.linalg.norm(b)
+        else:
+            normal = _random_unit(rng)
+            ratio = 1.0
+        start_i = center - width_n // 2
+        vec[stop:start_i] = b
+        stop = start_i + width_n
+        f = (np.arange(width_n) + 0.5) / width_n
+        vec[start_i:stop] = _transition(b, normal, angle, ratio, f)
+        b = _transition(b, normal, angle, ratio, np.ones(1))[0]
+    vec[stop:] = b
+    vec += rng.normal(scale=noise * b0, size=vec.shape)
+
+    keep = np.ones(n, dtype=bool)
+    if gap_fraction > 0:
+        # non-overlapping gaps: random positions in the data without the gaps, shifted by the previous gaps
+        gap_n = int(n * gap_fraction / n_gaps)
+        gap_starts = np.sort(rng.integers(0, n - n_gaps * gap_n, n_gaps)) + np.arange(n_gaps) * gap_n
+        for gap_start in gap_starts:
+            keep[gap_start : gap_start + gap_n] = False
+
+    ts_us = ts // timedelta(microseconds=1)
+    start_us = (start - datetime(1970, 1, 1)) // timedelta(microseconds=1)
+    time = start_us + np.arange(n) * ts_us
+
+    data = pl.DataFrame(
+        {"time": time[keep], **{col: vec[keep, i] for i, col in enumerate(bcols)}}
+    )
+    detectable = keep[centers]
+    truth = pl.DataFrame(
+        {
+            "time": time[centers[detectable]],
+            "type": np.where(is_td, "TD", "RD")[detectable],
+            "rotation_angle": np.degrees(angles)[detectable],
+        }
+    )
+    return (
+        data.with_columns(pl.col("time").cast(pl.Datetime("us")).set_sorted()),
+        truth.with_columns(pl.col("time").cast(pl.Datetime("us"))),
+    )